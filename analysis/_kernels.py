@@ -0,0 +1,436 @@
+"""
+Numeric kernels for the analysis engine.
+
+Single-pass reductions over NaN-free float64 arrays:
+- numeric_summary: count, mean, central moment sums (M2/M3/M4), min, max
+- iqr_outlier_mask: outlier mask + count for [lo, hi] bounds
+- uniform_histogram: equal-width histogram from precomputed min/max
+- batched_uniform_histogram: the same for every column of a 2-D array (NaN skipped)
+- space_saving: Space-Saving heavy-hitters sketch over 64-bit value hashes
+- approx_mad: histogram-based median absolute deviation (no sort)
+- HyperLogLog: distinct-count sketch over 64-bit value hashes
+
+Numba is optional. When it is installed the kernels are JIT-compiled with
+`nogil=True` (so per-column threads run them concurrently) and parallelized
+for very large columns; otherwise the NumPy fallbacks below are
+used with identical semantics.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+try:  # optional dependency
+    from numba import njit, prange
+
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - depends on environment
+    HAVE_NUMBA = False
+
+# Above this size, the parallel (two-pass) summary kernel is used.
+PARALLEL_THRESHOLD = 1_000_000
+
+# Block size for the NumPy histogram fallback (bounds temporaries to ~L2-sized tiles)
+_HIST_BLOCK = 65_536
+
+NumericSummary = Tuple[int, float, float, float, float, float, float]
+# (n, mean, m2, m3, m4, min, max); m2/m3/m4 are sums of centered powers
+
+
+def _numeric_summary_numpy(arr: np.ndarray) -> NumericSummary:
+    n = int(arr.size)
+    mean = float(arr.mean())
+    d = arr - mean
+    d2 = d * d
+    m2 = float(d2.sum())
+    m3 = float(np.einsum("i,i->", d2, d))
+    m4 = float(np.einsum("i,i->", d2, d2))
+    return n, mean, m2, m3, m4, float(arr.min()), float(arr.max())
+
+
+def _iqr_outlier_mask_numpy(arr: np.ndarray, lo: float, hi: float) -> Tuple[np.ndarray, int]:
+    mask = (arr < lo) | (arr > hi)
+    return mask, int(np.count_nonzero(mask))
+
+
+def _histogram_edges(lo: float, hi: float, nbins: int) -> Tuple[float, float, np.ndarray]:
+    # Same degenerate-range handling as np.histogram
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    return lo, hi, np.linspace(lo, hi, nbins + 1)
+
+
+def _uniform_histogram_numpy(arr: np.ndarray, lo: float, hi: float, edges: np.ndarray) -> np.ndarray:
+    nbins = edges.size - 1
+    norm = nbins / (hi - lo)
+    counts = np.zeros(nbins, dtype=np.intp)
+    for start in range(0, arr.size, _HIST_BLOCK):
+        block = arr[start : start + _HIST_BLOCK]
+        idx = ((block - lo) * norm).astype(np.intp)
+        idx[idx == nbins] -= 1
+        # Correct float rounding at bin edges, exactly as np.histogram does
+        idx[block < edges[idx]] -= 1
+        idx[(block >= edges[idx + 1]) & (idx != nbins - 1)] += 1
+        counts += np.bincount(idx, minlength=nbins)
+    return counts
+
+
+def _batched_uniform_histogram_numpy(
+    cols: np.ndarray, los: np.ndarray, his: np.ndarray, edges: np.ndarray
+) -> np.ndarray:
+    counts = np.zeros((cols.shape[0], edges.shape[1] - 1), dtype=np.intp)
+    for c in range(cols.shape[0]):
+        col = cols[c]
+        col = col[~np.isnan(col)]
+        counts[c] = _uniform_histogram_numpy(col, los[c], his[c], edges[c])
+    return counts
+
+
+def _space_saving_python(
+    hashes: np.ndarray, capacity: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # Same slot layout / eviction order as the Numba kernel, so results are identical
+    slot: dict = {}
+    keys: list = []
+    counts: list = []
+    errors: list = []
+    first: list = []
+    for i, h in enumerate(hashes.tolist()):
+        j = slot.get(h)
+        if j is not None:
+            counts[j] += 1
+        elif len(keys) < capacity:
+            slot[h] = len(keys)
+            keys.append(h)
+            counts.append(1)
+            errors.append(0)
+            first.append(i)
+        else:
+            j = counts.index(min(counts))
+            del slot[keys[j]]
+            slot[h] = j
+            keys[j] = h
+            errors[j] = counts[j]
+            counts[j] += 1
+            first[j] = i
+    return (
+        np.array(keys, dtype=np.uint64),
+        np.array(counts, dtype=np.int64),
+        np.array(errors, dtype=np.int64),
+        np.array(first, dtype=np.int64),
+    )
+
+
+def _abs_dev_counts_numpy(arr: np.ndarray, center: float, hi: float, nbins: int) -> np.ndarray:
+    counts = np.zeros(nbins, dtype=np.intp)
+    scale = nbins / hi
+    for start in range(0, arr.size, _HIST_BLOCK):
+        idx = (np.abs(arr[start : start + _HIST_BLOCK] - center) * scale).astype(np.intp)
+        np.minimum(idx, nbins - 1, out=idx)
+        counts += np.bincount(idx, minlength=nbins)
+    return counts
+
+
+if HAVE_NUMBA:
+
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _numeric_summary_welford(arr):  # pragma: no cover - compiled
+        # Welford/Terriberry online update: one pass, no sum-of-squares cancellation.
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        m3 = 0.0
+        m4 = 0.0
+        mn = arr[0]
+        mx = arr[0]
+        for i in range(arr.size):
+            x = arr[i]
+            if x < mn:
+                mn = x
+            if x > mx:
+                mx = x
+            n1 = n
+            n += 1
+            delta = x - mean
+            delta_n = delta / n
+            delta_n2 = delta_n * delta_n
+            term1 = delta * delta_n * n1
+            mean += delta_n
+            m4 += term1 * delta_n2 * (n * n - 3 * n + 3) + 6.0 * delta_n2 * m2 - 4.0 * delta_n * m3
+            m3 += term1 * delta_n * (n - 2) - 3.0 * delta_n * m2
+            m2 += term1
+        return n, mean, m2, m3, m4, mn, mx
+
+    @njit(cache=True, fastmath=True, parallel=True, nogil=True)
+    def _numeric_summary_parallel(arr):  # pragma: no cover - compiled
+        # Online updates serialize; for very large columns use two parallel reduction passes.
+        n = arr.size
+        total = 0.0
+        mn = arr[0]
+        mx = arr[0]
+        for i in prange(n):
+            x = arr[i]
+            total += x
+            mn = min(mn, x)
+            mx = max(mx, x)
+        mean = total / n
+        m2 = 0.0
+        m3 = 0.0
+        m4 = 0.0
+        for i in prange(n):
+            d = arr[i] - mean
+            d2 = d * d
+            m2 += d2
+            m3 += d2 * d
+            m4 += d2 * d2
+        return n, mean, m2, m3, m4, mn, mx
+
+    @njit(cache=True, nogil=True)
+    def _iqr_outlier_mask_numba(arr, lo, hi):  # pragma: no cover - compiled
+        mask = np.empty(arr.size, dtype=np.bool_)
+        count = 0
+        for i in range(arr.size):
+            x = arr[i]
+            out = x < lo or x > hi
+            mask[i] = out
+            if out:
+                count += 1
+        return mask, count
+
+    @njit(cache=True, nogil=True)
+    def _uniform_histogram_numba(arr, lo, hi, edges):  # pragma: no cover - compiled
+        nbins = edges.size - 1
+        norm = nbins / (hi - lo)
+        counts = np.zeros(nbins, dtype=np.intp)
+        for i in range(arr.size):
+            x = arr[i]
+            j = int((x - lo) * norm)
+            if j >= nbins:
+                j = nbins - 1
+            if x < edges[j]:
+                j -= 1
+            elif j != nbins - 1 and x >= edges[j + 1]:
+                j += 1
+            counts[j] += 1
+        return counts
+
+    @njit(cache=True, nogil=True, parallel=True)
+    def _batched_uniform_histogram_numba(cols, los, his, edges):  # pragma: no cover - compiled
+        # One launch for all columns; columns are independent, so split them across threads
+        ncols = cols.shape[0]
+        nbins = edges.shape[1] - 1
+        counts = np.zeros((ncols, nbins), dtype=np.intp)
+        for c in prange(ncols):
+            lo = los[c]
+            norm = nbins / (his[c] - lo)
+            for i in range(cols.shape[1]):
+                x = cols[c, i]
+                if np.isnan(x):
+                    continue
+                j = int((x - lo) * norm)
+                if j >= nbins:
+                    j = nbins - 1
+                if x < edges[c, j]:
+                    j -= 1
+                elif j != nbins - 1 and x >= edges[c, j + 1]:
+                    j += 1
+                counts[c, j] += 1
+        return counts
+
+    @njit(cache=True, nogil=True)
+    def _space_saving_numba(hashes, capacity):  # pragma: no cover - compiled
+        # Small monitored set (a few * k): linear probing beats a hash map here
+        keys = np.zeros(capacity, dtype=np.uint64)
+        counts = np.zeros(capacity, dtype=np.int64)
+        errors = np.zeros(capacity, dtype=np.int64)
+        first = np.zeros(capacity, dtype=np.int64)
+        size = 0
+        for i in range(hashes.size):
+            h = hashes[i]
+            hit = -1
+            for j in range(size):
+                if keys[j] == h:
+                    hit = j
+                    break
+            if hit >= 0:
+                counts[hit] += 1
+            elif size < capacity:
+                keys[size] = h
+                counts[size] = 1
+                first[size] = i
+                size += 1
+            else:
+                victim = 0
+                for j in range(1, size):
+                    if counts[j] < counts[victim]:
+                        victim = j
+                keys[victim] = h
+                errors[victim] = counts[victim]
+                counts[victim] += 1
+                first[victim] = i
+        return keys[:size], counts[:size], errors[:size], first[:size]
+
+    @njit(cache=True, nogil=True)
+    def _abs_dev_counts_numba(arr, center, hi, nbins):  # pragma: no cover - compiled
+        counts = np.zeros(nbins, dtype=np.intp)
+        scale = nbins / hi
+        for i in range(arr.size):
+            j = int(abs(arr[i] - center) * scale)
+            if j >= nbins:
+                j = nbins - 1
+            counts[j] += 1
+        return counts
+
+
+def numeric_summary(arr: np.ndarray) -> NumericSummary:
+    """
+    Count, mean, central moment sums, min and max of a non-empty NaN-free float64 array.
+
+    Returns:
+        (n, mean, m2, m3, m4, min, max) where m_k = sum((x - mean) ** k)
+    """
+    if not HAVE_NUMBA:
+        return _numeric_summary_numpy(arr)
+    arr = np.ascontiguousarray(arr, dtype=np.float64)
+    if arr.size > PARALLEL_THRESHOLD:
+        res = _numeric_summary_parallel(arr)
+    else:
+        res = _numeric_summary_welford(arr)
+    n, mean, m2, m3, m4, mn, mx = res
+    return int(n), float(mean), float(m2), float(m3), float(m4), float(mn), float(mx)
+
+
+def iqr_outlier_mask(arr: np.ndarray, lo: float, hi: float) -> Tuple[np.ndarray, int]:
+    """Boolean mask of values outside [lo, hi] plus its count, in one pass."""
+    if not HAVE_NUMBA:
+        return _iqr_outlier_mask_numpy(arr, lo, hi)
+    mask, count = _iqr_outlier_mask_numba(np.ascontiguousarray(arr, dtype=np.float64), float(lo), float(hi))
+    return mask, int(count)
+
+
+def uniform_histogram(arr: np.ndarray, lo: float, hi: float, nbins: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Equal-width histogram of a NaN-free array whose min/max are already known.
+
+    Equivalent to `np.histogram(arr, bins=nbins)` but reuses `lo`/`hi` instead of
+    re-scanning for the range, and bins with a single linear pass.
+
+    Returns:
+        (counts, bin_edges)
+    """
+    lo, hi, edges = _histogram_edges(float(lo), float(hi), int(nbins))
+    if HAVE_NUMBA:
+        counts = _uniform_histogram_numba(np.ascontiguousarray(arr, dtype=np.float64), lo, hi, edges)
+    else:
+        counts = _uniform_histogram_numpy(arr, lo, hi, edges)
+    return counts, edges
+
+
+def batched_uniform_histogram(
+    mat: np.ndarray, mins: np.ndarray, maxs: np.ndarray, nbins: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    `uniform_histogram` for every column of a 2-D array in a single kernel call.
+
+    NaNs are skipped; `mins`/`maxs` are the per-column ranges of the remaining
+    values. Column-major input (as pandas hands out float blocks) is binned
+    without a copy.
+
+    Returns:
+        (counts, bin_edges) with shapes (ncols, nbins) and (ncols, nbins + 1)
+    """
+    ncols = mat.shape[1]
+    nbins = int(nbins)
+    los = np.empty(ncols, dtype=np.float64)
+    his = np.empty(ncols, dtype=np.float64)
+    edges = np.empty((ncols, nbins + 1), dtype=np.float64)
+    for c in range(ncols):
+        los[c], his[c], edges[c] = _histogram_edges(float(mins[c]), float(maxs[c]), nbins)
+    # Rows of `cols` are columns of `mat`; free transpose for Fortran-ordered input
+    cols = np.ascontiguousarray(np.asarray(mat, dtype=np.float64).T)
+    if HAVE_NUMBA:
+        counts = _batched_uniform_histogram_numba(cols, los, his, edges)
+    else:
+        counts = _batched_uniform_histogram_numpy(cols, los, his, edges)
+    return counts, edges
+
+
+def space_saving(
+    hashes: np.ndarray, capacity: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Space-Saving heavy hitters over 64-bit value hashes using O(capacity) memory.
+
+    `counts` are upper bounds; `counts - errors` are guaranteed lower bounds
+    (exact for items that were never evicted).
+
+    Returns:
+        (hashes, counts, errors, first_index) of the monitored items, where
+        first_index is the position of the occurrence that (re)admitted the
+        item - use it to recover a representative original value.
+    """
+    hashes = np.ascontiguousarray(hashes, dtype=np.uint64)
+    capacity = max(1, int(capacity))
+    if HAVE_NUMBA:
+        return _space_saving_numba(hashes, capacity)
+    return _space_saving_python(hashes, capacity)
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch over 64-bit hashes.
+
+    With the default precision (p=12) the sketch is 4 KiB of registers with a
+    ~1.6% standard error, independent of the number of values added.
+    """
+
+    def __init__(self, p: int = 12) -> None:
+        self.p = int(p)
+        self.m = 1 << self.p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        h = np.ascontiguousarray(hashes, dtype=np.uint64)
+        if h.size == 0:
+            return
+        p = self.p
+        idx = (h >> np.uint64(64 - p)).astype(np.intp)
+        # Leading zeros of the remaining bits; keep the top 53 so the float conversion is exact
+        top = ((h << np.uint64(p)) >> np.uint64(11)).astype(np.float64)
+        _, exp = np.frexp(top)
+        rho = np.where(top > 0, 54 - exp, 64 - p + 1)
+        np.maximum.at(self.registers, idx, np.minimum(rho, 64 - p + 1).astype(np.uint8))
+
+    def estimate(self) -> float:
+        m = self.m
+        alpha = 0.7213 / (1.0 + 1.079 / m)
+        e = alpha * m * m / float(np.sum(np.exp2(-self.registers.astype(np.float64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if e <= 2.5 * m and zeros > 0:
+            # small-range correction (linear counting)
+            e = m * np.log(m / zeros)
+        return float(e)
+
+
+def approx_mad(arr: np.ndarray, center: float, hi: float, nbins: int = 1024) -> float:
+    """
+    Approximate median of |arr - center| from one histogram pass (no sort).
+
+    `hi` must bound the true MAD (e.g. max(q75 - q50, q50 - q25) when `center` is
+    the median); larger deviations are clamped into the last bin. The result is
+    linearly interpolated within its bin, so the error is at most hi / nbins.
+    """
+    if hi <= 0.0:
+        return 0.0
+    if HAVE_NUMBA:
+        counts = _abs_dev_counts_numba(np.ascontiguousarray(arr, dtype=np.float64), float(center), float(hi), nbins)
+    else:
+        counts = _abs_dev_counts_numpy(arr, float(center), float(hi), nbins)
+    cum = np.cumsum(counts)
+    half = arr.size / 2.0
+    b = int(np.searchsorted(cum, half))
+    before = float(cum[b - 1]) if b > 0 else 0.0
+    frac = (half - before) / float(counts[b]) if counts[b] > 0 else 0.0
+    return float((b + frac) * hi / nbins)
@@ -0,0 +1,88 @@
+"""
+Streaming Parquet readers shared by the analysis and schema engines.
+
+- read_parquet_head: first N rows, stopping once enough row groups are decoded
+- reservoir_sample_parquet: uniform row sample in one pass with O(k) memory
+
+Both decode only the requested columns and convert through Arrow's default
+pandas mapping, so dtypes match `pd.read_parquet`.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+_BATCH_ROWS = 65_536
+
+
+def _projected_schema(pf, columns: Optional[List[str]]):
+    import pyarrow as pa
+
+    if columns is None:
+        return pf.schema_arrow
+    return pa.schema([pf.schema_arrow.field(c) for c in columns])
+
+
+def read_parquet_head(file_path: Union[str, Path], columns: Optional[List[str]], row_limit: int) -> pd.DataFrame:
+    """First `row_limit` rows of `columns` (all if None)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(file_path)
+    batches = []
+    n = 0
+    if row_limit > 0:
+        for batch in pf.iter_batches(batch_size=min(row_limit, _BATCH_ROWS), columns=columns):
+            batches.append(batch)
+            n += batch.num_rows
+            if n >= row_limit:
+                break
+    schema = _projected_schema(pf, columns)
+    table = pa.Table.from_batches(batches, schema=schema) if batches else schema.empty_table()
+    return table.slice(0, row_limit).to_pandas()
+
+
+def reservoir_sample_parquet(
+    file_path: Union[str, Path], k: int, seed: int, columns: Optional[List[str]] = None
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Uniform sample of `k` rows from a parquet file in one streaming pass (Algorithm L).
+
+    Peak memory is O(k + batch) rows. Returns (sample, total_rows_in_file).
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(file_path)
+    rng = np.random.default_rng(seed)
+    reservoir: Optional[pa.Table] = None
+    seen = 0
+    # Algorithm L state: W and the stream index of the next row to admit
+    w = float(np.exp(np.log(rng.random()) / k))
+    next_i = k + int(np.floor(np.log(rng.random()) / np.log1p(-w)))
+
+    for batch in pf.iter_batches(batch_size=_BATCH_ROWS, columns=columns):
+        table = pa.Table.from_batches([batch])
+        start, end = seen, seen + table.num_rows
+        seen = end
+        if start < k:
+            # Fill phase: take rows until the reservoir holds k
+            head = table.slice(0, k - start)
+            reservoir = head if reservoir is None else pa.concat_tables([reservoir, head])
+        if next_i >= end:
+            continue
+        # Reservoir slot -> row index into concat(reservoir, table); last write per slot wins
+        take = np.arange(k)
+        while next_i < end:
+            take[rng.integers(k)] = k + (next_i - start)
+            w *= float(np.exp(np.log(rng.random()) / k))
+            next_i += int(np.floor(np.log(rng.random()) / np.log1p(-w))) + 1
+        reservoir = pa.concat_tables([reservoir, table]).take(take)
+
+    if reservoir is None:
+        return _projected_schema(pf, columns).empty_table().to_pandas(), 0
+    return reservoir.combine_chunks().to_pandas(), seen
@@ -0,0 +1,148 @@
+"""
+Content hashing for dataset files (stdlib only, so the API can hash without
+importing pandas).
+
+`content_hash_file` produces the `file_hash` stored with every schema and used by
+the API for memory-first ingest dedup. Digests carry their algorithm as a prefix
+(`xxh3:<hex>`, `sha256:<hex>`; tree digests of large files add a "t", e.g.
+`xxh3t:<hex>`), so hashes persisted by deployments with and without xxhash stay
+distinguishable; bare 64-char digests from older stores are SHA-256 (see
+`normalize_file_hash`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional, Union
+
+try:  # optional dependency: fast non-cryptographic file hashing
+    import xxhash
+except ImportError:  # pragma: no cover - depends on environment
+    xxhash = None
+
+_MMAP_HASH_MIN_BYTES = 100 * 1024 * 1024
+_HASH_CHUNK_BYTES = 1 << 20
+_TREE_HASH_MIN_BYTES = 256 * 1024 * 1024
+_TREE_HASH_CHUNK_BYTES = 64 * 1024 * 1024
+
+# Digest schemes (the prefix before ":" in every file_hash)
+HASH_SCHEME_XXH3 = "xxh3"
+HASH_SCHEME_SHA256 = "sha256"
+# Appended to the scheme of tree digests (files over _TREE_HASH_MIN_BYTES)
+TREE_SCHEME_SUFFIX = "t"
+_HASH_CONSTRUCTORS = {HASH_SCHEME_SHA256: hashlib.sha256}
+if xxhash is not None:
+    _HASH_CONSTRUCTORS[HASH_SCHEME_XXH3] = xxhash.xxh3_128
+
+
+def normalize_file_hash(file_hash: str) -> str:
+    """Canonical form of a stored file_hash: bare (pre-prefix) digests were SHA-256."""
+    if ":" in file_hash:
+        return file_hash
+    return f"{HASH_SCHEME_SHA256}:{file_hash}"
+
+
+def file_hash_scheme(file_hash: str) -> str:
+    """Scheme prefix of a file_hash, e.g. "xxh3t" (legacy bare digests report "sha256")."""
+    return normalize_file_hash(file_hash).split(":", 1)[0]
+
+
+def _tree_hash(buf: Any, new_hash: Any) -> str:
+    """
+    Two-level hash of a large buffer: fixed-size chunks are hashed concurrently
+    (hashing releases the GIL), then the concatenated chunk digests are hashed.
+    """
+    view = memoryview(buf)
+    try:
+        def leaf(start: int) -> bytes:
+            h = new_hash()
+            h.update(view[start:start + _TREE_HASH_CHUNK_BYTES])
+            return h.digest()
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            digests = list(ex.map(leaf, range(0, len(view), _TREE_HASH_CHUNK_BYTES)))
+    finally:
+        view.release()
+    root = new_hash()
+    root.update(b"".join(digests))
+    return root.hexdigest()
+
+
+def _tree_hex_digest(file_path: Union[str, Path], algorithm: str) -> str:
+    new_hash = _HASH_CONSTRUCTORS[algorithm]
+    try:
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _tree_hash(mm, new_hash)
+    except (OSError, ValueError, OverflowError):
+        pass  # Not mappable: same tree, leaves read sequentially
+    digests = []
+    with open(file_path, "rb", buffering=0) as f:
+        buf = memoryview(bytearray(_TREE_HASH_CHUNK_BYTES))
+        while True:
+            # readinto may return short reads; fill each leaf to the full chunk size
+            filled = 0
+            while filled < len(buf) and (n := f.readinto(buf[filled:])):
+                filled += n
+            if not filled:
+                break
+            h = new_hash()
+            h.update(buf[:filled])
+            digests.append(h.digest())
+    root = new_hash()
+    root.update(b"".join(digests))
+    return root.hexdigest()
+
+
+def content_hash_file(
+    file_path: Union[str, Path], algorithm: Optional[str] = None, tree: bool = True
+) -> str:
+    """
+    Prefixed hex digest of a file's content (`<scheme>:<hex>`), used as a cache /
+    dedup key.
+
+    Defaults to XXH3-128 when `xxhash` is installed, SHA-256 otherwise: the key only
+    has to detect changed content, so the hash is non-cryptographic when it can be.
+    Digests of different schemes never compare equal; pass algorithm="sha256" to
+    match hashes stored by a SHA-256 deployment. Files over 256 MiB are hashed as a
+    tree of 64 MiB chunks across threads; that digest differs from a plain hash of
+    the bytes, so its scheme is marked with a "t" (tree=False forces a plain hash).
+
+    Raises:
+        ValueError: Unknown algorithm, or "xxh3" without xxhash installed
+    """
+    if algorithm is None:
+        algorithm = HASH_SCHEME_XXH3 if xxhash is not None else HASH_SCHEME_SHA256
+    if algorithm not in _HASH_CONSTRUCTORS:
+        raise ValueError(f"Unsupported hash algorithm: {algorithm!r}")
+    if tree and os.path.getsize(file_path) > _TREE_HASH_MIN_BYTES:
+        return f"{algorithm}{TREE_SCHEME_SUFFIX}:{_tree_hex_digest(file_path, algorithm)}"
+    return f"{algorithm}:{_hex_digest(file_path, algorithm)}"
+
+
+def _hex_digest(file_path: Union[str, Path], algorithm: str) -> str:
+    new_hash = _HASH_CONSTRUCTORS[algorithm]
+    size = os.path.getsize(file_path)
+    if size >= _MMAP_HASH_MIN_BYTES:
+        # Large files: hash the whole mapping in one update call, paging in on demand
+        try:
+            with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h = new_hash()
+                h.update(mm)
+                return h.hexdigest()
+        except (OSError, ValueError, OverflowError):
+            pass  # Not mappable (e.g. exceeds address space): fall back to reading
+    # Unbuffered: reads are already 1 MiB, so Python-side buffering only adds a copy
+    with open(file_path, "rb", buffering=0) as f:
+        if algorithm == HASH_SCHEME_SHA256 and hasattr(hashlib, "file_digest"):
+            # Python 3.11+: read/update loop runs in C
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = new_hash()
+        # One reusable buffer instead of a fresh bytes object per read
+        buf = memoryview(bytearray(_HASH_CHUNK_BYTES))
+        while n := f.readinto(buf):
+            h.update(buf[:n])
+    return h.hexdigest()
@@ -8,19 +8,52 @@ This module handles:
 - Detecting schema and distribution drift
 """
 
-import hashlib
 import json
-from dataclasses import dataclass, asdict
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields, replace
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 import pandas as pd
 import numpy as np
 
+try:  # statistical tests for distribution drift; bound once, not per column
+    from scipy import stats as _stats
+except ImportError:  # pragma: no cover - depends on environment
+    _stats = None
 
-@dataclass
+try:  # Arrow compute kernels for numeric column reductions (pandas fallback)
+    import pyarrow as _pa
+    import pyarrow.compute as _pc
+except ImportError:  # pragma: no cover - depends on environment
+    _pa = _pc = None
+
+try:  # optional dependency: faster JSON encoding/decoding
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+from analysis._kernels import HyperLogLog, batched_uniform_histogram
+from analysis._parquet import reservoir_sample_parquet
+from analysis.hashing import content_hash_file
+
+
+# Sentinel for lazily computed slots
+_UNSET = object()
+
+
+@dataclass(eq=False, slots=True)
 class ColumnSchema:
-    """Compressed representation of a single column's schema."""
+    """
+    Compressed representation of a single column's schema.
+
+    Histogram and quantile arrays are held as NumPy arrays in memory and only
+    converted to lists at the serialization boundary (`to_dict`).
+    """
     name: str
     dtype: str
     null_percentage: float
@@ -35,34 +68,100 @@ class ColumnSchema:
     # For categorical columns
     top_values: Optional[Dict[str, int]] = None  # {value: count} for top 5
     # Distribution signature (compressed histogram)
-    histogram_bins: Optional[List[float]] = None  # 10-bin histogram for numeric
-    histogram_counts: Optional[List[int]] = None
+    histogram_bins: Optional[np.ndarray] = None  # 10-bin histogram for numeric (float64 edges)
+    histogram_counts: Optional[np.ndarray] = None  # int64
+    # Quantile sketch for approximate KS drift (numeric columns over _APPROX_MIN_N, approx only)
+    quantiles: Optional[np.ndarray] = None  # values at 0%, 2%, ..., 100%
+    quantile_count: Optional[int] = None  # non-null values the sketch summarizes
+    # Lazily computed by `histogram_signature` and `to_dict` (not serialized)
+    _histogram_signature: Any = field(default=_UNSET, init=False, repr=False)
+    _dict_view: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    
+    def __post_init__(self) -> None:
+        # Accept lists (e.g. from JSON) and store typed arrays
+        if self.histogram_bins is not None:
+            self.histogram_bins = np.asarray(self.histogram_bins, dtype=np.float64)
+        if self.histogram_counts is not None:
+            self.histogram_counts = np.asarray(self.histogram_counts, dtype=np.int64)
+        if self.quantiles is not None:
+            self.quantiles = np.asarray(self.quantiles, dtype=np.float64)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name not in _COLUMN_SCHEMA_CACHE_SLOTS:
+            # Any field assignment invalidates the lazily computed views
+            object.__setattr__(self, '_histogram_signature', _UNSET)
+            object.__setattr__(self, '_dict_view', None)
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ColumnSchema):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+    
+    @property
+    def histogram_signature(self) -> Optional[Tuple[np.ndarray, float]]:
+        """Normalized histogram and its L2 norm, computed once per schema (not serialized)."""
+        if self._histogram_signature is _UNSET:
+            signature = None
+            if self.histogram_counts is not None and self.histogram_counts.size > 0:
+                counts = self.histogram_counts.astype(np.float64)
+                hist_norm = counts / (counts.sum() + 1e-10)
+                signature = (hist_norm, float(np.linalg.norm(hist_norm)))
+            self._histogram_signature = signature
+        return self._histogram_signature
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization."""
-        return asdict(self)
+        """
+        Convert to dictionary for serialization (None fields are omitted).
+        
+        The converted values are built once and reused until a field is reassigned;
+        each call returns a fresh copy, so callers may mutate the result.
+        """
+        if self._dict_view is None:
+            result = {}
+            for name in _COLUMN_SCHEMA_FIELDS:
+                value = getattr(self, name)
+                if value is None:
+                    continue
+                if isinstance(value, np.ndarray):
+                    value = value.tolist()
+                elif isinstance(value, dict):
+                    value = dict(value)
+                result[name] = value
+            self._dict_view = result
+        # Copy the container values too (histogram lists, top_values): cheap next
+        # to re-running ndarray.tolist(), and keeps the cached view intact
+        return {
+            k: v.copy() if isinstance(v, (list, dict)) else v
+            for k, v in self._dict_view.items()
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ColumnSchema':
-        """Create from dictionary."""
-        return cls(**data)
+        """Create from dictionary (missing optional fields default to None)."""
+        return cls(**{name: data[name] for name in _COLUMN_SCHEMA_FIELDS if name in data})
+
 
+# Serialized ColumnSchema fields (excludes the lazily computed cache slots)
+_COLUMN_SCHEMA_FIELDS = tuple(f.name for f in fields(ColumnSchema) if f.init)
+_COLUMN_SCHEMA_CACHE_SLOTS = frozenset(f.name for f in fields(ColumnSchema) if not f.init)
 
-@dataclass
+
+@dataclass(slots=True)
 class DatasetSchema:
     """Compressed schema representation of an entire dataset."""
     dataset_id: str
     version: str
     file_path: str
-    file_hash: str  # SHA256 of file content
+    file_hash: str  # Content hash (see `content_hash_file`), opaque
     row_count: int
     column_count: int
     created_at: str
     columns: Dict[str, ColumnSchema]  # column_name -> ColumnSchema
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization."""
-        result = asdict(self)
+        """Convert to dictionary for serialization (column dicts are cached per column)."""
+        result = {f.name: getattr(self, f.name) for f in fields(self)}
         result['columns'] = {k: v.to_dict() for k, v in self.columns.items()}
         return result
     
@@ -77,15 +176,21 @@ class DatasetSchema:
     
     def to_compressed_json(self) -> str:
         """Serialize to compressed JSON string."""
+        if orjson is not None:
+            return orjson.dumps(
+                self.to_dict(), option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ).decode('utf-8')
         return json.dumps(self.to_dict(), separators=(',', ':'))
     
     @classmethod
     def from_compressed_json(cls, json_str: str) -> 'DatasetSchema':
         """Deserialize from compressed JSON string."""
+        if orjson is not None:
+            return cls.from_dict(orjson.loads(json_str))
         return cls.from_dict(json.loads(json_str))
 
 
-@dataclass
+@dataclass(slots=True)
 class SchemaDrift:
     """Represents schema-level drift between two dataset versions."""
     added_columns: List[str]
@@ -105,7 +210,7 @@ class SchemaDrift:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class DistributionDrift:
     """Represents distribution-level drift for a single column."""
     column_name: str
@@ -126,7 +231,7 @@ class DistributionDrift:
         return self.p_value < p_threshold and self.similarity_score < 0.8
 
 
-@dataclass
+@dataclass(slots=True)
 class DriftReport:
     """Complete drift analysis between two schema versions."""
     base_version: str
@@ -143,56 +248,373 @@ class DriftReport:
         )
 
 
+# Above this many values, approximate mode estimates distinct counts (HyperLogLog)
+# and drift KS tests run on quantile sketches instead of the raw data. Sketches are
+# only stored for columns this large in the source file: they go into the LLM
+# prompts with the rest of the schema and would roughly double a small one.
+# HyperLogLog counts the values actually scanned, so at the default
+# sample_size=100000 it never triggers (sampling already bounds the hash set).
+_APPROX_MIN_N = 100_000
+_SKETCH_QUANTILES = np.linspace(0.0, 1.0, 51)
+
+
+def _require_scipy_stats():
+    """Return `scipy.stats`, or raise a clear error when SciPy is not installed."""
+    if _stats is None:
+        raise ImportError("scipy is required for distribution drift tests (pip install scipy)")
+    return _stats
+
+
+def _column_kind(dtype: Any) -> str:
+    """
+    Classify a column dtype as 'numeric', 'object', 'category', 'datetime' or 'other'.
+
+    NumPy dtypes (the common case) are classified from the single-char `dtype.kind`;
+    extension dtypes go through the pandas predicates. Same answers as
+    `is_numeric_dtype` / `is_object_dtype` / `is_datetime64_any_dtype`.
+    """
+    if isinstance(dtype, np.dtype):
+        kind = dtype.kind
+        if kind in 'iufcb':
+            return 'numeric'
+        if kind == 'M':
+            return 'datetime'
+        return 'object' if kind == 'O' else 'other'
+    if isinstance(dtype, pd.CategoricalDtype):
+        return 'category'
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 'numeric'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    return 'other'
+
+
+def _arrow_numeric_stats(values: np.ndarray) -> Tuple[float, float, float, Any, Any]:
+    """
+    (mean, median, std, min, max) of a 1-D NumPy column via pyarrow.compute.
+
+    NaN counts as missing, as in the pandas reductions; sample std (ddof=1) and an
+    exact linearly interpolated median match `Series.std` / `Series.median`.
+    Undefined results are NaN.
+    """
+    arr = _pa.array(values, from_pandas=True)
+    min_max = _pc.min_max(arr)
+    results = (
+        _pc.mean(arr).as_py(),
+        _pc.quantile(arr, q=0.5)[0].as_py() if len(arr) > arr.null_count else None,
+        _pc.stddev(arr, ddof=1).as_py(),
+        min_max['min'].as_py(),
+        min_max['max'].as_py(),
+    )
+    return tuple(np.nan if v is None else v for v in results)
+
+
+def _sketch_ks_2samp(
+    base_q: np.ndarray, base_n: int, compare_q: np.ndarray, compare_n: int
+) -> tuple:
+    """
+    Two-sample KS statistic and asymptotic p-value from two quantile sketches.
+
+    CDFs are linearly interpolated between the sketch points, which tracks the
+    exact statistic closely for continuous data; for heavily tied (discrete) data
+    the error is up to one quantile step (2%). The p-value uses the effective
+    sample size of the underlying data, as `ks_2samp(method='asymp')` does.
+    """
+    stats = _require_scipy_stats()
+    q1 = np.asarray(base_q, dtype=np.float64)
+    q2 = np.asarray(compare_q, dtype=np.float64)
+    x = np.concatenate([q1, q2])
+    d = float(np.max(np.abs(np.interp(x, q1, _SKETCH_QUANTILES) - np.interp(x, q2, _SKETCH_QUANTILES))))
+    en = base_n * compare_n / (base_n + compare_n)
+    return d, float(stats.kstwo.sf(d, max(1, int(round(en)))))
+
+
+def _has_sketches(base_col: ColumnSchema, compare_col: ColumnSchema, approx: bool) -> bool:
+    """Whether both columns carry quantile sketches usable for an approximate KS test."""
+    return bool(
+        approx
+        and base_col.quantiles is not None and base_col.quantile_count
+        and compare_col.quantiles is not None and compare_col.quantile_count
+    )
+
+
+def _batch_ks_2samp(base: np.ndarray, compare: np.ndarray) -> List[Optional[tuple]]:
+    """
+    Two-sample KS tests for every column of two 2-D float arrays (NaN = missing).
+
+    Both matrices are sorted once along axis 0 (NaNs sort last), so each column's
+    valid values are a sorted prefix. Statistics are computed with searchsorted
+    exactly as `ks_2samp` does; p-values use the asymptotic distribution when
+    either side has more than 10k values (what `ks_2samp`'s 'auto' mode picks),
+    otherwise `ks_2samp` itself is called on the presorted prefixes for the exact
+    p-value. Columns with no values on either side yield None.
+    """
+    stats = _require_scipy_stats()
+    base_sorted = np.sort(base, axis=0)
+    compare_sorted = np.sort(compare, axis=0)
+    base_n = np.count_nonzero(~np.isnan(base), axis=0)
+    compare_n = np.count_nonzero(~np.isnan(compare), axis=0)
+    
+    results: List[Optional[tuple]] = []
+    for j in range(base.shape[1]):
+        n1, n2 = int(base_n[j]), int(compare_n[j])
+        if n1 == 0 or n2 == 0:
+            results.append(None)
+            continue
+        a = base_sorted[:n1, j]
+        b = compare_sorted[:n2, j]
+        if max(n1, n2) <= 10_000:
+            d, p = stats.ks_2samp(a, b)
+            results.append((d, p))
+            continue
+        x = np.concatenate([a, b])
+        cddiffs = np.searchsorted(a, x, side='right') / n1 - np.searchsorted(b, x, side='right') / n2
+        d = max(float(np.clip(-cddiffs.min(), 0, 1)), float(cddiffs.max()))
+        en = np.round(n1 * n2 / float(n1 + n2))
+        results.append((d, float(np.clip(stats.kstwo.sf(d, en), 0, 1))))
+    return results
+
+
 class SchemaEngine:
     """Engine for extracting, compressing, and comparing dataset schemas."""
     
-    def __init__(self, data_dir: Union[str, Path] = "data"):
+    def __init__(
+        self,
+        data_dir: Union[str, Path] = "data",
+        schema_cache_ttl: float = 30.0,
+        schema_cache_size: int = 128,
+        max_workers: Optional[int] = None,
+        schema_cache_persist_every: int = 16
+    ):
         """
         Initialize the schema engine.
         
         Args:
             data_dir: Directory where datasets are stored
+            schema_cache_ttl: Seconds an extracted schema is reused for an unchanged
+                file (0 disables the cache)
+            schema_cache_size: Maximum number of cached schemas (least recently used evicted)
+            max_workers: Threads for per-column statistics (defaults to CPU count)
+            schema_cache_persist_every: New cache entries between writes of the
+                on-disk cache; `flush_schema_cache()` writes the rest (e.g. on shutdown)
         """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
+        self.schema_cache_ttl = float(schema_cache_ttl)
+        self.schema_cache_size = int(schema_cache_size)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # cache key -> (stored_at, schema); persisted so it survives restarts
+        self._schema_cache_path = self.data_dir / '.schema_cache'
+        self._schema_cache: "OrderedDict[str, Tuple[float, DatasetSchema]]" = OrderedDict()
+        # extract_schema runs from several API worker threads
+        self._schema_cache_lock = threading.Lock()
+        self.schema_cache_persist_every = max(1, int(schema_cache_persist_every))
+        self._schema_cache_unsaved = 0
+        if self.schema_cache_ttl > 0:
+            self._load_schema_cache()
+    
+    def _schema_cache_key(self, file_path: Path, sample_size: Optional[int], approx: bool) -> str:
+        """Cache key from path, mtime and size (no hashing needed for a lookup)."""
+        st = file_path.stat()
+        return f"{file_path.resolve()}|{st.st_mtime_ns}|{st.st_size}|{sample_size}|{approx}"
+    
+    def _load_schema_cache(self) -> None:
+        """Load unexpired entries of the on-disk schema cache (ignored if unreadable)."""
+        if not self._schema_cache_path.exists():
+            return
+        try:
+            raw = self._schema_cache_path.read_bytes()
+            entries = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            now = time.time()
+            for key, (stored_at, schema_dict) in entries.items():
+                if now - stored_at < self.schema_cache_ttl:
+                    self._schema_cache[key] = (stored_at, DatasetSchema.from_dict(schema_dict))
+        except (OSError, ValueError, TypeError, KeyError):
+            self._schema_cache.clear()
+    
+    def flush_schema_cache(self) -> None:
+        """Write cache entries added since the last save to disk (no-op if none)."""
+        with self._schema_cache_lock:
+            if self._schema_cache_unsaved:
+                self._save_schema_cache()
+    
+    def _save_schema_cache(self) -> None:
+        """Write the schema cache to disk (best effort; caller holds the cache lock)."""
+        self._schema_cache_unsaved = 0
+        entries = {k: (t, schema.to_dict()) for k, (t, schema) in self._schema_cache.items()}
+        try:
+            if orjson is not None:
+                data = orjson.dumps(entries, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+            else:
+                data = json.dumps(entries, separators=(',', ':')).encode('utf-8')
+            self._schema_cache_path.write_bytes(data)
+        except (OSError, TypeError):
+            pass
+    
+    def _get_cached_schema(self, key: str) -> Optional[DatasetSchema]:
+        with self._schema_cache_lock:
+            entry = self._schema_cache.get(key)
+            if entry is None:
+                return None
+            stored_at, schema = entry
+            if time.time() - stored_at >= self.schema_cache_ttl:
+                del self._schema_cache[key]
+                return None
+            self._schema_cache.move_to_end(key)
+            return schema
+    
+    def _put_cached_schema(self, key: str, schema: DatasetSchema) -> None:
+        # Entries for an older mtime/size of the same file can never hit again
+        prefix = key.split('|', 1)[0] + '|'
+        with self._schema_cache_lock:
+            for stale in [k for k in self._schema_cache if k.startswith(prefix) and k != key]:
+                del self._schema_cache[stale]
+            self._schema_cache[key] = (time.time(), schema)
+            self._schema_cache.move_to_end(key)
+            while len(self._schema_cache) > self.schema_cache_size:
+                self._schema_cache.popitem(last=False)
+            # Rewriting every cached schema per miss is too costly on the ingest path
+            self._schema_cache_unsaved += 1
+            if self._schema_cache_unsaved >= self.schema_cache_persist_every:
+                self._save_schema_cache()
     
     def _compute_file_hash(self, file_path: Path) -> str:
-        """Compute SHA256 hash of file content."""
-        sha256 = hashlib.sha256()
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+        """Content hash of the file (see `content_hash_file`)."""
+        return content_hash_file(file_path)
     
-    def _extract_column_schema(
-        self, 
-        df: pd.DataFrame, 
+    def _precompute_column_stats(
+        self, df: pd.DataFrame, approx: bool = False, total_count: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Compute per-column statistics for the whole frame in a few DataFrame-level passes.
+
+        Reductions run once per dtype block instead of once per column; only the
+        histograms and value counts, which are inherently per column, loop.
+
+        Args:
+            df: (Possibly sampled) DataFrame to summarize
+            approx: Estimate distinct counts of large columns with HyperLogLog and
+                store quantile sketches for large numeric columns
+            total_count: Rows in the source file when `df` is a sample (defaults
+                to len(df)); sketch eligibility is judged on the full column
+        """
+        # One pass over the dtypes (no per-column Series construction)
+        numeric_cols, categorical_cols, datetime_cols = [], [], []
+        for c, dtype in df.dtypes.items():
+            kind = _column_kind(dtype)
+            if kind == 'numeric':
+                numeric_cols.append(c)
+            elif kind in ('object', 'category'):
+                categorical_cols.append(c)
+            elif kind == 'datetime':
+                datetime_cols.append(c)
+
+        num_df = df[numeric_cols]
+        dt_df = df[datetime_cols]
+        # Single null pass for the whole frame; non-null counts are derived from it
+        nulls = df.isnull().sum()
+        num_counts = len(df) - nulls[numeric_cols]
+        # Plain NumPy int/float columns reduce in Arrow's C++ kernels (zero-copy, one
+        # column at a time on the pool below); bools and extension dtypes use pandas
+        arrow_cols = [c for c in numeric_cols if _pc is not None and num_df[c].dtype.kind in 'iuf']
+        pandas_num_df = num_df.drop(columns=arrow_cols)
+        num_stats = {
+            'mean': pandas_num_df.mean().to_dict(),
+            'median': pandas_num_df.median().to_dict(),
+            'std': pandas_num_df.std().to_dict(),
+            'min': pandas_num_df.min().to_dict(),
+            'max': pandas_num_df.max().to_dict(),
+        }
+        if arrow_cols:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
+                arrow_results = ex.map(lambda c: _arrow_numeric_stats(num_df[c].to_numpy()), arrow_cols)
+                for c, col_stats in zip(arrow_cols, arrow_results):
+                    for key, value in zip(('mean', 'median', 'std', 'min', 'max'), col_stats):
+                        num_stats[key][c] = value
+        num_min = num_stats['min']
+        num_max = num_stats['max']
+
+        # Histograms for all numeric columns with enough values in one batched kernel call
+        hist_cols = [c for c in numeric_cols if num_counts[c] > 10]
+        histograms = {}
+        if hist_cols:
+            counts, edges = batched_uniform_histogram(
+                num_df[hist_cols].to_numpy(dtype=np.float64, na_value=np.nan),
+                [num_min[c] for c in hist_cols], [num_max[c] for c in hist_cols], 10
+            )
+            histograms = {c: (counts[i], edges[i]) for i, c in enumerate(hist_cols)}
+
+        # Sketch only columns whose non-null count in the whole file exceeds
+        # _APPROX_MIN_N (sample counts scaled up by the sampling ratio)
+        scale = (total_count or len(df)) / len(df) if len(df) else 0.0
+        sketch_cols = [c for c in numeric_cols if approx and num_counts[c] * scale > _APPROX_MIN_N]
+
+        def numeric_quantiles(c: str) -> Optional[np.ndarray]:
+            if num_counts[c] == 0:
+                return None
+            arr = num_df[c].to_numpy(dtype=np.float64, na_value=np.nan)
+            if nulls[c] > 0:
+                arr = arr[~np.isnan(arr)]
+            return np.quantile(arr, _SKETCH_QUANTILES)
+
+        def hll_cardinality(c: str) -> int:
+            hll = HyperLogLog()
+            hll.add_hashes(pd.util.hash_pandas_object(df[c].dropna(), index=False).to_numpy())
+            return int(round(hll.estimate()))
+
+        # Per-column work left over after the frame-level reductions; the histogram
+        # kernel and pandas hashing release the GIL, so columns run concurrently
+        with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
+            quantile_results = list(ex.map(numeric_quantiles, sketch_cols))
+            # Object/categorical columns are hashed once: value_counts also yields the
+            # distinct count (observed categories only), so nunique skips them
+            vc_results = list(ex.map(lambda c: df[c].value_counts(), categorical_cols))
+            value_counts = dict(zip(categorical_cols, vc_results))
+            # Large columns in approximate mode: constant-memory distinct count instead of a hash set
+            other_cols = [c for c in df.columns if c not in value_counts]
+            hll_cols = [c for c in other_cols if approx and len(df) - nulls[c] > _APPROX_MIN_N]
+            hll_results = list(ex.map(hll_cardinality, hll_cols))
+        quantiles = {c: q for c, q in zip(sketch_cols, quantile_results) if q is not None}
+        hll_set = set(hll_cols)
+        nuniques = df[[c for c in other_cols if c not in hll_set]].nunique().to_dict()
+        nuniques.update(zip(hll_cols, hll_results))
+        nuniques.update({c: int((vc > 0).sum()) for c, vc in value_counts.items()})
+
+        return {
+            'nulls': nulls,
+            'nuniques': nuniques,
+            'numeric_columns': set(numeric_cols),
+            'numeric_counts': num_counts,
+            'numeric_stats': num_stats,
+            'histograms': histograms,
+            'quantiles': quantiles,
+            'value_counts': value_counts,
+            'datetime_counts': len(df) - nulls[datetime_cols],
+            'datetime_min': dt_df.min(),
+            'datetime_max': dt_df.max(),
+        }
+
+    def _build_column_schema(
+        self,
         col_name: str,
-        sample_size: Optional[int] = None
+        dtype: Any,
+        total_count: int,
+        precomputed: Dict[str, Any]
     ) -> ColumnSchema:
         """
-        Extract compressed schema for a single column.
-        
+        Assemble the compressed schema for a single column from precomputed statistics.
+
         Args:
-            df: DataFrame
             col_name: Name of the column
-            sample_size: Optional sample size for large datasets
+            dtype: Column dtype
+            total_count: Row count of the full (unsampled) dataset
+            precomputed: Output of `_precompute_column_stats`
         """
-        col = df[col_name]
-        total_count = len(col)
-        
-        # Handle sampling for very large datasets
-        if sample_size and total_count > sample_size:
-            col = col.sample(n=sample_size, random_state=42)
-            sample_count = len(col)
-        else:
-            sample_count = total_count
-        
         # Basic metadata
-        dtype_str = str(col.dtype)
-        null_count = col.isnull().sum()
+        dtype_str = str(dtype)
+        null_count = precomputed['nulls'][col_name]
         null_percentage = (null_count / total_count) * 100 if total_count > 0 else 0.0
-        unique_count = col.nunique()
+        unique_count = int(precomputed['nuniques'][col_name])
         cardinality = unique_count
         unique_ratio = unique_count / total_count if total_count > 0 else 0.0
         
@@ -205,26 +627,33 @@ class SchemaEngine:
         top_values = None
         histogram_bins = None
         histogram_counts = None
+        quantiles = None
+        quantile_count = None
         
         # Numeric columns
-        if pd.api.types.is_numeric_dtype(col):
-            numeric_col = col.dropna()
-            if len(numeric_col) > 0:
-                mean = float(numeric_col.mean())
-                median = float(numeric_col.median())
-                std = float(numeric_col.std()) if len(numeric_col) > 1 else 0.0
-                min_val = float(numeric_col.min())
-                max_val = float(numeric_col.max())
+        if col_name in precomputed['numeric_columns']:
+            count = precomputed['numeric_counts'][col_name]
+            if count > 0:
+                num_stats = precomputed['numeric_stats']
+                mean = float(num_stats['mean'][col_name])
+                median = float(num_stats['median'][col_name])
+                std = float(num_stats['std'][col_name]) if count > 1 else 0.0
+                min_val = float(num_stats['min'][col_name])
+                max_val = float(num_stats['max'][col_name])
                 
                 # Compressed histogram (10 bins)
-                if len(numeric_col) > 10:
-                    counts, bins = np.histogram(numeric_col, bins=10)
-                    histogram_bins = bins.tolist()
-                    histogram_counts = counts.tolist()
+                if col_name in precomputed['histograms']:
+                    counts, bins = precomputed['histograms'][col_name]
+                    histogram_bins = bins
+                    histogram_counts = counts
+                
+                if col_name in precomputed['quantiles']:
+                    quantiles = precomputed['quantiles'][col_name]
+                    quantile_count = int(count)
         
         # Categorical/object columns
-        elif pd.api.types.is_object_dtype(col) or pd.api.types.is_categorical_dtype(col):
-            value_counts = col.value_counts()
+        elif col_name in precomputed['value_counts']:
+            value_counts = precomputed['value_counts'][col_name]
             if len(value_counts) > 0:
                 # Top 5 values
                 top_values = {
@@ -235,11 +664,10 @@ class SchemaEngine:
                 max_val = str(value_counts.index[-1]) if len(value_counts) > 0 else None
         
         # Datetime columns
-        elif pd.api.types.is_datetime64_any_dtype(col):
-            datetime_col = col.dropna()
-            if len(datetime_col) > 0:
-                min_val = str(datetime_col.min())
-                max_val = str(datetime_col.max())
+        elif col_name in precomputed['datetime_counts']:
+            if precomputed['datetime_counts'][col_name] > 0:
+                min_val = str(precomputed['datetime_min'][col_name])
+                max_val = str(precomputed['datetime_max'][col_name])
         
         return ColumnSchema(
             name=col_name,
@@ -254,7 +682,9 @@ class SchemaEngine:
             max=max_val,
             top_values=top_values,
             histogram_bins=histogram_bins,
-            histogram_counts=histogram_counts
+            histogram_counts=histogram_counts,
+            quantiles=quantiles,
+            quantile_count=quantile_count
         )
     
     def extract_schema(
@@ -262,7 +692,8 @@ class SchemaEngine:
         file_path: Union[str, Path],
         dataset_id: Optional[str] = None,
         version: Optional[str] = None,
-        sample_size: Optional[int] = 100000
+        sample_size: Optional[int] = 100000,
+        approx: bool = True
     ) -> DatasetSchema:
         """
         Extract compressed schema from a dataset file.
@@ -272,6 +703,10 @@ class SchemaEngine:
             dataset_id: Optional dataset identifier (defaults to filename stem)
             version: Optional version string (defaults to timestamp)
             sample_size: Sample size for large datasets (None = no sampling)
+            approx: Store quantile sketches for numeric columns with more than 100k
+                non-null values in the file (enables drift KS without the raw data)
+                and estimate distinct counts via HyperLogLog when more than 100k
+                values are scanned (only possible with sample_size None or > 100k)
         
         Returns:
             DatasetSchema object
@@ -286,34 +721,66 @@ class SchemaEngine:
         if version is None:
             version = datetime.now().isoformat()
         
+        # Unchanged file within the TTL: reuse the stats, re-stamp the identifiers
+        cache_key = None
+        if self.schema_cache_ttl > 0:
+            cache_key = self._schema_cache_key(file_path, sample_size, approx)
+            cached = self._get_cached_schema(cache_key)
+            if cached is not None:
+                return replace(
+                    cached,
+                    dataset_id=dataset_id,
+                    version=version,
+                    file_path=str(file_path),
+                    created_at=datetime.now().isoformat(),
+                    # Fresh ColumnSchema objects: callers may mutate them
+                    columns={k: replace(c) for k, c in cached.columns.items()}
+                )
+        
         # Compute file hash
         file_hash = self._compute_file_hash(file_path)
         
-        # Load dataset
+        # Load dataset (sampled for very large datasets; same rows for every column)
         if file_path.suffix.lower() == '.parquet':
-            df = pd.read_parquet(file_path)
+            import pyarrow.parquet as pq
+            # Row count comes from the footer; no data pages are decoded for it
+            total_count = pq.ParquetFile(file_path).metadata.num_rows
+            if sample_size and total_count > sample_size:
+                # Stream row groups into a reservoir instead of materializing the whole file
+                sampled, _ = reservoir_sample_parquet(file_path, sample_size, seed=42)
+            else:
+                sampled = pd.read_parquet(file_path)
         elif file_path.suffix.lower() == '.csv':
             df = pd.read_csv(file_path, low_memory=False)
+            total_count = len(df)
+            if sample_size and total_count > sample_size:
+                sampled = df.sample(n=sample_size, random_state=42)
+            else:
+                sampled = df
         else:
             raise ValueError(f"Unsupported file format: {file_path.suffix}")
         
-        # Extract column schemas
+        # Extract column schemas from frame-level aggregations
+        precomputed = self._precompute_column_stats(sampled, approx=approx, total_count=total_count)
         columns = {}
-        for col_name in df.columns:
-            columns[col_name] = self._extract_column_schema(
-                df, col_name, sample_size=sample_size
+        for col_name in sampled.columns:
+            columns[col_name] = self._build_column_schema(
+                col_name, sampled[col_name].dtype, total_count, precomputed
             )
         
-        return DatasetSchema(
+        schema = DatasetSchema(
             dataset_id=dataset_id,
             version=version,
             file_path=str(file_path),
             file_hash=file_hash,
-            row_count=len(df),
-            column_count=len(df.columns),
+            row_count=total_count,
+            column_count=len(sampled.columns),
             created_at=datetime.now().isoformat(),
             columns=columns
         )
+        if cache_key is not None:
+            self._put_cached_schema(cache_key, schema)
+        return schema
     
     def detect_schema_drift(
         self,
@@ -337,34 +804,39 @@ class SchemaEngine:
         removed_columns = list(base_cols - compare_cols)
         common_columns = base_cols & compare_cols
         
-        type_changes = {}
-        null_percentage_changes = {}
-        cardinality_changes = {}
-        
-        for col in common_columns:
-            base_col = base_schema.columns[col]
-            compare_col = compare_schema.columns[col]
-            
-            # Type changes
-            if base_col.dtype != compare_col.dtype:
-                type_changes[col] = (base_col.dtype, compare_col.dtype)
-            
-            # Null percentage changes (significant if > 5% change)
-            null_diff = abs(base_col.null_percentage - compare_col.null_percentage)
-            if null_diff > 5.0:
-                null_percentage_changes[col] = (
-                    base_col.null_percentage,
-                    compare_col.null_percentage
-                )
-            
-            # Cardinality changes (significant if > 20% change)
-            if base_col.cardinality > 0:
-                card_ratio = compare_col.cardinality / base_col.cardinality
-                if card_ratio < 0.8 or card_ratio > 1.2:
-                    cardinality_changes[col] = (
-                        base_col.cardinality,
-                        compare_col.cardinality
-                    )
+        # Compare all common columns at once; Python work only for flagged columns
+        common = list(common_columns)
+        base_meta = [base_schema.columns[c] for c in common]
+        compare_meta = [compare_schema.columns[c] for c in common]
+        
+        base_dtypes = np.array([c.dtype for c in base_meta], dtype=object)
+        compare_dtypes = np.array([c.dtype for c in compare_meta], dtype=object)
+        base_nulls = np.fromiter((c.null_percentage for c in base_meta), dtype=np.float64, count=len(common))
+        compare_nulls = np.fromiter((c.null_percentage for c in compare_meta), dtype=np.float64, count=len(common))
+        base_card = np.fromiter((c.cardinality for c in base_meta), dtype=np.float64, count=len(common))
+        compare_card = np.fromiter((c.cardinality for c in compare_meta), dtype=np.float64, count=len(common))
+        
+        # Type changes
+        type_mask = base_dtypes != compare_dtypes
+        # Null percentage changes (significant if > 5% change)
+        null_mask = np.abs(base_nulls - compare_nulls) > 5.0
+        # Cardinality changes (significant if > 20% change)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            card_ratio = compare_card / base_card
+        card_mask = (base_card > 0) & ((card_ratio < 0.8) | (card_ratio > 1.2))
+        
+        type_changes = {
+            common[i]: (base_meta[i].dtype, compare_meta[i].dtype)
+            for i in np.flatnonzero(type_mask)
+        }
+        null_percentage_changes = {
+            common[i]: (base_meta[i].null_percentage, compare_meta[i].null_percentage)
+            for i in np.flatnonzero(null_mask)
+        }
+        cardinality_changes = {
+            common[i]: (base_meta[i].cardinality, compare_meta[i].cardinality)
+            for i in np.flatnonzero(card_mask)
+        }
         
         return SchemaDrift(
             added_columns=added_columns,
@@ -380,7 +852,8 @@ class SchemaEngine:
         compare_schema: DatasetSchema,
         column_name: str,
         base_df: Optional[pd.DataFrame] = None,
-        compare_df: Optional[pd.DataFrame] = None
+        compare_df: Optional[pd.DataFrame] = None,
+        approx: bool = True
     ) -> DistributionDrift:
         """
         Detect distribution drift for a specific column.
@@ -391,10 +864,27 @@ class SchemaEngine:
             column_name: Column to analyze
             base_df: Optional base DataFrame (for detailed analysis)
             compare_df: Optional compare DataFrame (for detailed analysis)
+            approx: Use the schemas' quantile sketches for the KS test when the
+                data is large (> 100k values) or not provided
         
         Returns:
             DistributionDrift object
         """
+        return self._distribution_drift(
+            base_schema, compare_schema, column_name, base_df, compare_df, approx
+        )
+    
+    def _distribution_drift(
+        self,
+        base_schema: DatasetSchema,
+        compare_schema: DatasetSchema,
+        column_name: str,
+        base_df: Optional[pd.DataFrame],
+        compare_df: Optional[pd.DataFrame],
+        approx: bool,
+        ks_result: Optional[tuple] = None
+    ) -> DistributionDrift:
+        """`detect_distribution_drift`, optionally with a KS result already computed in batch."""
         if column_name not in base_schema.columns or column_name not in compare_schema.columns:
             raise ValueError(f"Column {column_name} not found in both schemas")
         
@@ -405,42 +895,55 @@ class SchemaEngine:
         ks_statistic = None
         chi2_statistic = None
         p_value = None
+        has_sketches = _has_sketches(base_col, compare_col, approx)
         
-        if base_df is not None and compare_df is not None:
+        if ks_result is not None:
+            ks_statistic, p_value = ks_result
+        elif base_df is not None and compare_df is not None:
             if column_name in base_df.columns and column_name in compare_df.columns:
                 base_series = base_df[column_name].dropna()
                 compare_series = compare_df[column_name].dropna()
                 
-                if pd.api.types.is_numeric_dtype(base_series):
+                kind = _column_kind(base_series.dtype)
+                if kind == 'numeric':
                     # Kolmogorov-Smirnov test for numeric
-                    from scipy import stats
-                    if len(base_series) > 0 and len(compare_series) > 0:
+                    stats = _require_scipy_stats()
+                    if has_sketches and len(base_series) + len(compare_series) > _APPROX_MIN_N:
+                        # Large data: compare sketches instead of sorting both samples
+                        ks_statistic, p_value = _sketch_ks_2samp(
+                            base_col.quantiles, base_col.quantile_count,
+                            compare_col.quantiles, compare_col.quantile_count
+                        )
+                    elif len(base_series) > 0 and len(compare_series) > 0:
                         ks_statistic, p_value = stats.ks_2samp(base_series, compare_series)
-                elif pd.api.types.is_object_dtype(base_series):
+                elif kind == 'object':
                     # Chi-square test for categorical
-                    from scipy import stats
-                    # Get common categories
-                    all_cats = set(base_series.unique()) | set(compare_series.unique())
-                    base_counts = [sum(base_series == cat) for cat in all_cats]
-                    compare_counts = [sum(compare_series == cat) for cat in all_cats]
-                    if sum(base_counts) > 0 and sum(compare_counts) > 0:
+                    stats = _require_scipy_stats()
+                    # Count each side once (hash aggregation), then align on the union of categories
+                    base_vc = base_series.value_counts()
+                    compare_vc = compare_series.value_counts()
+                    all_cats = base_vc.index.union(compare_vc.index)
+                    base_counts = base_vc.reindex(all_cats, fill_value=0).to_numpy()
+                    compare_counts = compare_vc.reindex(all_cats, fill_value=0).to_numpy()
+                    if base_counts.sum() > 0 and compare_counts.sum() > 0:
                         chi2_statistic, p_value = stats.chisquare(base_counts, compare_counts)
+        elif has_sketches:
+            # No raw data: the schemas' quantile sketches still support a KS test
+            ks_statistic, p_value = _sketch_ks_2samp(
+                base_col.quantiles, base_col.quantile_count,
+                compare_col.quantiles, compare_col.quantile_count
+            )
         
         # Compute similarity score from compressed histograms
         similarity_score = 1.0
-        if base_col.histogram_bins and compare_col.histogram_bins:
+        if base_col.histogram_bins is not None and compare_col.histogram_bins is not None:
             # Simple histogram overlap metric
-            base_counts = np.array(base_col.histogram_counts or [])
-            compare_counts = np.array(compare_col.histogram_counts or [])
-            if len(base_counts) > 0 and len(compare_counts) > 0:
-                # Normalize
-                base_norm = base_counts / (base_counts.sum() + 1e-10)
-                compare_norm = compare_counts / (compare_counts.sum() + 1e-10)
-                # Cosine similarity
-                similarity_score = float(
-                    np.dot(base_norm, compare_norm) / 
-                    (np.linalg.norm(base_norm) * np.linalg.norm(compare_norm) + 1e-10)
-                )
+            base_sig = base_col.histogram_signature
+            compare_sig = compare_col.histogram_signature
+            if base_sig is not None and compare_sig is not None:
+                # Cosine similarity of the pre-normalized histograms
+                (base_norm, base_l2), (compare_norm, compare_l2) = base_sig, compare_sig
+                similarity_score = float(base_norm @ compare_norm / (base_l2 * compare_l2 + 1e-10))
         
         # Mean/std shifts for numeric
         mean_shift = None
@@ -465,7 +968,8 @@ class SchemaEngine:
         base_schema: DatasetSchema,
         compare_schema: DatasetSchema,
         base_df: Optional[pd.DataFrame] = None,
-        compare_df: Optional[pd.DataFrame] = None
+        compare_df: Optional[pd.DataFrame] = None,
+        approx: bool = True
     ) -> DriftReport:
         """
         Generate complete drift report between two schema versions.
@@ -475,6 +979,7 @@ class SchemaEngine:
             compare_schema: Schema to compare against
             base_df: Optional base DataFrame
             compare_df: Optional compare DataFrame
+            approx: Allow sketch-based KS tests (see `detect_distribution_drift`)
         
         Returns:
             DriftReport object
@@ -485,12 +990,39 @@ class SchemaEngine:
         # Distribution drift for common columns
         common_columns = set(base_schema.columns.keys()) & set(compare_schema.columns.keys())
         distribution_drifts = {}
+        # Similarities collected unboxed while iterating, reduced once below
+        similarities = np.empty(len(common_columns), dtype=np.float64)
+        
+        # Exact KS tests for all numeric columns at once (one sort per frame)
+        ks_results = {}
+        if base_df is not None and compare_df is not None:
+            ks_columns = []
+            for col in common_columns:
+                if col not in base_df.columns or col not in compare_df.columns:
+                    continue
+                if _column_kind(base_df[col].dtype) != 'numeric' or _column_kind(compare_df[col].dtype) != 'numeric':
+                    continue
+                # Large samples with sketches take the sketch path in detect_distribution_drift
+                if (
+                    _has_sketches(base_schema.columns[col], compare_schema.columns[col], approx)
+                    and base_df[col].count() + compare_df[col].count() > _APPROX_MIN_N
+                ):
+                    continue
+                ks_columns.append(col)
+            if ks_columns:
+                batch = _batch_ks_2samp(
+                    base_df[ks_columns].to_numpy(dtype=np.float64, na_value=np.nan),
+                    compare_df[ks_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+                )
+                ks_results = {col: res for col, res in zip(ks_columns, batch) if res is not None}
         
-        for col in common_columns:
-            drift = self.detect_distribution_drift(
-                base_schema, compare_schema, col, base_df, compare_df
+        for i, col in enumerate(common_columns):
+            drift = self._distribution_drift(
+                base_schema, compare_schema, col, base_df, compare_df, approx,
+                ks_result=ks_results.get(col)
             )
             distribution_drifts[col] = drift
+            similarities[i] = drift.similarity_score
         
         # Compute overall drift score (0-1, higher = more drift)
         drift_components = []
@@ -503,7 +1035,7 @@ class SchemaEngine:
         
         # Distribution changes
         if distribution_drifts:
-            avg_similarity = np.mean([d.similarity_score for d in distribution_drifts.values()])
+            avg_similarity = float(similarities.mean())
             drift_components.append(1.0 - avg_similarity)
         
         overall_drift_score = float(np.mean(drift_components)) if drift_components else 0.0
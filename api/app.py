@@ -18,40 +18,104 @@ LLM Pipeline:
 2. Ollama for local LLM generation (fully free, llama3.1:8b)
 
 Environment:
-- `.env` is loaded at startup via python-dotenv
+- `.env` is loaded once per process (first app creation) via python-dotenv
 - SCALEDOWN_API_KEY for compression (optional)
 - OLLAMA_BASE_URL for local LLM (default: http://localhost:11434)
 """
 
 from __future__ import annotations
 
-import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from dataclasses import asdict
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
 
+import anyio
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel, Field
 
-from analysis.analysis_engine import AnalysisEngine
-from analysis.schema_engine import DatasetSchema, SchemaEngine
+from analysis.hashing import HASH_SCHEME_SHA256, TREE_SCHEME_SUFFIX, content_hash_file, file_hash_scheme
 from llm.scaledown_client import ScaledownClientError, ScaledownCompressionClient
 from llm.ollama_client import OllamaClientError, OllamaLLMClient
 from memory.store import MemoryStore, StoredAnalysis, StoredInsight, StoredSchema
 from reasoning.insight_reasoner import InsightReasoner, insights_to_summaries, insight_to_stored_insight_payload
 
+if TYPE_CHECKING:
+    # pandas/numpy/scipy come in with the engines; they are imported on first use
+    from analysis.analysis_engine import AnalysisEngine
+    from analysis.schema_engine import DatasetSchema, SchemaEngine
 
-DATA_DIR = Path("data")
 
+DATA_DIR = Path("data")
 
-def _sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            h.update(chunk)
-    return h.hexdigest()
+_ENV_LOADED = False
+
+
+def _load_env_once() -> None:
+    # `.env` is parsed at most once per process, however many apps are created
+    # (no-op if .env is missing).
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        load_dotenv()
+        _ENV_LOADED = True
+
+
+# (path, mtime_ns, size, algorithm, tree) -> content hash; unchanged files skip re-hashing on repeat ingests
+_HASH_CACHE: "OrderedDict[Tuple[str, int, int, Optional[str], bool], str]" = OrderedDict()
+_HASH_CACHE_MAX = 1024
+_HASH_CACHE_LOCK = threading.Lock()
+
+
+def _content_hash_file(path: Path, algorithm: Optional[str] = None, tree: bool = True) -> str:
+    # Same content hash the schema engine stores as `file_hash` (default algorithm),
+    # so memory-first dedup can compare the two directly.
+    st = path.stat()
+    key = (str(path.resolve()), st.st_mtime_ns, st.st_size, algorithm, tree)
+    with _HASH_CACHE_LOCK:
+        cached = _HASH_CACHE.get(key)
+        if cached is not None:
+            _HASH_CACHE.move_to_end(key)
+            return cached
+    file_hash = content_hash_file(path, algorithm, tree)
+    with _HASH_CACHE_LOCK:
+        _HASH_CACHE[key] = file_hash
+        _HASH_CACHE.move_to_end(key)
+        while len(_HASH_CACHE) > _HASH_CACHE_MAX:
+            _HASH_CACHE.popitem(last=False)
+    return file_hash
+
+
+# (dataset_id, version) -> (compressed JSON it was parsed from, schema); the JSON
+# identity check makes a re-saved schema miss without explicit invalidation
+_SCHEMA_CACHE: "OrderedDict[Tuple[str, str], Tuple[str, DatasetSchema]]" = OrderedDict()
+_SCHEMA_CACHE_MAX = 256
+_SCHEMA_CACHE_LOCK = threading.Lock()
+
+
+def _parsed_schema(stored: StoredSchema) -> DatasetSchema:
+    # Parsed DatasetSchema for a stored schema, reused across requests (treat as read-only)
+    key = (stored.dataset_id, stored.version)
+    with _SCHEMA_CACHE_LOCK:
+        entry = _SCHEMA_CACHE.get(key)
+        if entry is not None and entry[0] is stored.compressed_schema_json:
+            _SCHEMA_CACHE.move_to_end(key)
+            return entry[1]
+    from analysis.schema_engine import DatasetSchema
+
+    schema = DatasetSchema.from_compressed_json(stored.compressed_schema_json)
+    with _SCHEMA_CACHE_LOCK:
+        _SCHEMA_CACHE[key] = (stored.compressed_schema_json, schema)
+        _SCHEMA_CACHE.move_to_end(key)
+        while len(_SCHEMA_CACHE) > _SCHEMA_CACHE_MAX:
+            _SCHEMA_CACHE.popitem(last=False)
+    return schema
 
 
 def _parse_vnum(v: str) -> int:
@@ -81,12 +145,18 @@ def _latest_version(existing_versions: List[str]) -> Optional[str]:
     return existing_versions[-1]
 
 
-def _find_version_by_hash(store: MemoryStore, dataset_id: str, file_hash: str) -> Optional[str]:
-    for v in store.list_versions(dataset_id):
-        s = store.get_schema(dataset_id, v)
-        if s and s.file_hash == file_hash:
-            return v
-    return None
+def _etag(value: str) -> str:
+    return f'"{value}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match covers `etag` (weak comparison, `*` matches)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
 
 
 # -----------------------------
@@ -148,15 +218,46 @@ class CompareResponse(BaseModel):
 
 
 def create_app() -> FastAPI:
-    # Load environment variables at app startup (no-op if .env is missing).
-    load_dotenv()
+    # Environment variables must be loaded before the singletons below read them.
+    _load_env_once()
 
-    app = FastAPI(title="Advanced Data Analysis Agent")
+    # Created once at startup rather than on every /ingest request
+    DATA_DIR.mkdir(exist_ok=True)
 
     # Core singletons (thin orchestration layer)
+    # Store writes are batched; the lifespan hook flushes what is pending on shutdown
+    # (and the schema engine's on-disk cache, if the engine was ever built), then
+    # stops the compression client's worker threads
     store = MemoryStore(persist_path=os.getenv("MEMORY_STORE_PATH"))
-    schema_engine = SchemaEngine(data_dir=DATA_DIR)
-    analysis_engine = AnalysisEngine()
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+        try:
+            yield
+        finally:
+            await anyio.to_thread.run_sync(store.flush)
+            if compression_client is not None:
+                await anyio.to_thread.run_sync(compression_client.close)
+            if get_schema_engine.cache_info().currsize:
+                await anyio.to_thread.run_sync(get_schema_engine().flush_schema_cache)
+
+    app = FastAPI(title="Advanced Data Analysis Agent", lifespan=lifespan)
+    # Query answers and drift reports can be large JSON; compress for clients that accept gzip
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+    # Engines pull in pandas/numpy/scipy: built on first use, so cold starts and
+    # requests served from memory (cached /ingest, /query) never import them
+    @lru_cache(maxsize=1)
+    def get_schema_engine() -> SchemaEngine:
+        from analysis.schema_engine import SchemaEngine
+
+        return SchemaEngine(data_dir=DATA_DIR)
+
+    @lru_cache(maxsize=1)
+    def get_analysis_engine() -> AnalysisEngine:
+        from analysis.analysis_engine import AnalysisEngine
+
+        return AnalysisEngine()
     
     # LLM Pipeline:
     # 1. Ollama for local LLM generation (free, fully local)
@@ -173,35 +274,52 @@ def create_app() -> FastAPI:
     # Reasoner with optional compression
     reasoner = InsightReasoner(llm, compression_client=compression_client)
 
+    # Handlers are async so the event loop stays free; blocking work (hashing, pandas,
+    # LLM calls, store persistence) runs via anyio.to_thread.run_sync. In-memory
+    # store lookups stay inline.
+
     @app.post("/ingest", response_model=IngestResponse)
-    def ingest(req: IngestRequest) -> IngestResponse:
-        DATA_DIR.mkdir(exist_ok=True)
+    async def ingest(req: IngestRequest) -> IngestResponse:
         path = DATA_DIR / req.filename
         if not path.exists():
             raise HTTPException(status_code=404, detail=f"File not found under data/: {req.filename}")
 
         dataset_id = req.dataset_id or path.stem
-        file_hash = _sha256_file(path)
+        file_hash = await anyio.to_thread.run_sync(_content_hash_file, path)
 
         # Memory-first: if this file_hash is already ingested, do not recompute schema.
-        existing_v = _find_version_by_hash(store, dataset_id, file_hash)
+        existing_v = store.find_version_by_hash(dataset_id, file_hash)
+        # Versions ingested by a SHA-256 deployment (or before hashes carried a
+        # scheme) only match a SHA-256 digest of the same bytes, plain or tree
+        for scheme, tree in ((HASH_SCHEME_SHA256, False), (HASH_SCHEME_SHA256 + TREE_SCHEME_SUFFIX, True)):
+            if existing_v is not None:
+                break
+            if file_hash_scheme(file_hash) != scheme and store.has_hash_scheme(dataset_id, scheme):
+                existing_v = store.find_version_by_hash(
+                    dataset_id,
+                    await anyio.to_thread.run_sync(_content_hash_file, path, HASH_SCHEME_SHA256, tree),
+                )
         if existing_v:
             return IngestResponse(dataset_id=dataset_id, version=existing_v, file_hash=file_hash, cached=True)
 
         version = _next_version(store.list_versions(dataset_id))
-        ds_schema = schema_engine.extract_schema(file_path=path, dataset_id=dataset_id, version=version)
-        store.save_schema(
+        ds_schema = await anyio.to_thread.run_sync(
+            partial(get_schema_engine().extract_schema, file_path=path, dataset_id=dataset_id, version=version)
+        )
+        await anyio.to_thread.run_sync(
+            store.save_schema,
             StoredSchema(
                 dataset_id=dataset_id,
                 version=version,
                 file_hash=ds_schema.file_hash,
                 compressed_schema_json=ds_schema.to_compressed_json(),
-            )
+            ),
         )
         return IngestResponse(dataset_id=dataset_id, version=version, file_hash=ds_schema.file_hash, cached=False)
 
-    @app.post("/analyze", response_model=AnalyzeResponse)
-    def analyze(req: AnalyzeRequest) -> AnalyzeResponse:
+    async def _analyze(req: AnalyzeRequest, response: Response, request: Optional[Request] = None) -> Any:
+        # `request` is passed by the GET route only: If-None-Match -> 304 is GET/HEAD
+        # semantics (RFC 9110), so POST always answers with the full body
         dataset_id = req.dataset_id
         version = req.version or _latest_version(store.list_versions(dataset_id))
         if not version:
@@ -215,20 +333,36 @@ def create_app() -> FastAPI:
 
         # Memory-first analysis
         analysis_cached = store.has_analysis(dataset_id, version)
+
+        # The file content fixes analysis and insights; once both are stored the
+        # client's copy is current. Scoped like query_hash: every dataset/version
+        # shares this URL, even when ingested from the same file.
+        etag = _etag(MemoryStore.stable_hash(f"{dataset_id}|{version}|{stored_schema.file_hash}"))
+        response.headers["ETag"] = etag
+        if (
+            request is not None
+            and analysis_cached
+            and store.list_insights_for_version(dataset_id, version)
+            and _etag_matches(request, etag)
+        ):
+            return Response(status_code=304, headers={"ETag": etag})
         if not analysis_cached:
-            ds_schema = DatasetSchema.from_compressed_json(stored_schema.compressed_schema_json)
+            ds_schema = _parsed_schema(stored_schema)
             file_path = Path(ds_schema.file_path)
             if not file_path.exists():
                 raise HTTPException(status_code=404, detail=f"Underlying data file missing: {ds_schema.file_path}")
 
-            result = analysis_engine.analyze_file(file_path=file_path, dataset_id=dataset_id, version=version)
-            store.save_analysis(
+            result = await anyio.to_thread.run_sync(
+                partial(get_analysis_engine().analyze_file, file_path=file_path, dataset_id=dataset_id, version=version)
+            )
+            await anyio.to_thread.run_sync(
+                store.save_analysis,
                 StoredAnalysis(
                     dataset_id=dataset_id,
                     version=version,
                     analysis_result=result.to_compressed_json(),
-                    created_at=result.created_at,
-                )
+                    created_at_ns=time.time_ns(),
+                ),
             )
 
         stored_analysis = store.get_analysis(dataset_id, version)
@@ -236,20 +370,21 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=500, detail="Analysis missing after save (unexpected).")
 
         # Memory-first insights (version-scoped)
-        existing = store.list_insights(dataset_id)
-        existing_for_version = [i for i in existing if i.version == version]
-        insights_cached = len(existing_for_version) > 0
+        insights_cached = len(store.list_insights_for_version(dataset_id, version)) > 0
         insights_created = 0
 
         if not insights_cached:
-            existing_summaries = [i.summary for i in existing]  # dataset-level (helps dedup across versions)
+            existing_summaries = [i.summary for i in store.list_insights(dataset_id)]  # dataset-level (helps dedup across versions)
             try:
-                new_insights = reasoner.synthesize_insights(
-                    dataset_id=dataset_id,
-                    version=version,
-                    compressed_schema_json=stored_schema.compressed_schema_json,
-                    compressed_analysis_result_json=stored_analysis.analysis_result,
-                    existing_insight_summaries=existing_summaries,
+                new_insights = await anyio.to_thread.run_sync(
+                    partial(
+                        reasoner.synthesize_insights,
+                        dataset_id=dataset_id,
+                        version=version,
+                        compressed_schema_json=stored_schema.compressed_schema_json,
+                        compressed_analysis_result_json=stored_analysis.analysis_result,
+                        existing_insight_summaries=existing_summaries,
+                    )
                 )
             except (ScaledownClientError, OllamaClientError) as e:
                 # Deterministic behavior: do not retry here, and do not hide the failure.
@@ -258,10 +393,13 @@ def create_app() -> FastAPI:
                     status_code=502,
                     detail=f"LLM unavailable for insight synthesis. Check Ollama is running at http://localhost:11434. Error: {e}",
                 )
-            for ins in new_insights:
-                payload = insight_to_stored_insight_payload(ins, dataset_id=dataset_id, version=version)
-                store.save_insight(StoredInsight(**payload))
-                insights_created += 1
+            rows = [
+                StoredInsight(**insight_to_stored_insight_payload(ins, dataset_id=dataset_id, version=version))
+                for ins in new_insights
+            ]
+            # One store write for the whole batch
+            await anyio.to_thread.run_sync(store.save_insights, rows)
+            insights_created = len(rows)
 
         return AnalyzeResponse(
             dataset_id=dataset_id,
@@ -272,8 +410,19 @@ def create_app() -> FastAPI:
             insights_created=insights_created,
         )
 
-    @app.post("/query", response_model=QueryResponse)
-    def query(req: QueryRequest) -> QueryResponse:
+    @app.post("/analyze", response_model=AnalyzeResponse)
+    async def analyze(req: AnalyzeRequest, response: Response) -> Any:
+        return await _analyze(req, response)
+
+    @app.get("/analyze", response_model=AnalyzeResponse)
+    async def analyze_get(
+        dataset_id: str, request: Request, response: Response, version: Optional[str] = None
+    ) -> Any:
+        """POST /analyze as a cacheable read: answers 304 when If-None-Match is current."""
+        return await _analyze(AnalyzeRequest(dataset_id=dataset_id, version=version), response, request)
+
+    async def _query(req: QueryRequest, response: Response, request: Optional[Request] = None) -> Any:
+        # Conditional handling for the GET route only (see _analyze)
         dataset_id = req.dataset_id
         version = req.version or _latest_version(store.list_versions(dataset_id))
         if not version:
@@ -284,13 +433,17 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=404, detail="Schema not found in memory. Call /ingest first.")
 
         stored_analysis = store.get_analysis(dataset_id, version)  # analysis is optional for some queries
-        insights = [i for i in store.list_insights(dataset_id) if i.version == version]
+        insights = store.list_insights_for_version(dataset_id, version)
         summaries = [i.summary for i in insights]
 
         # Query cache (include version to avoid stale answers)
         query_hash = MemoryStore.stable_hash(f"{dataset_id}|{version}|{req.question}")
+        etag = _etag(query_hash)
+        response.headers["ETag"] = etag
         cached = store.get_cached_query(query_hash, dataset_id)
         if cached:
+            if request is not None and _etag_matches(request, etag):
+                return Response(status_code=304, headers={"ETag": etag})
             return QueryResponse(
                 dataset_id=dataset_id,
                 version=version,
@@ -301,13 +454,16 @@ def create_app() -> FastAPI:
 
         # LLM reasoning lives in reasoning layer (not in API)
         try:
-            answer = reasoner.answer_query(
-                dataset_id=dataset_id,
-                version=version,
-                question=req.question,
-                compressed_schema_json=stored_schema.compressed_schema_json,
-                compressed_analysis_result_json=stored_analysis.analysis_result if stored_analysis else None,
-                insight_summaries=summaries,
+            answer = await anyio.to_thread.run_sync(
+                partial(
+                    reasoner.answer_query,
+                    dataset_id=dataset_id,
+                    version=version,
+                    question=req.question,
+                    compressed_schema_json=stored_schema.compressed_schema_json,
+                    compressed_analysis_result_json=stored_analysis.analysis_result if stored_analysis else None,
+                    insight_summaries=summaries,
+                )
             )
         except (ScaledownClientError, OllamaClientError) as e:
             raise HTTPException(
@@ -315,7 +471,9 @@ def create_app() -> FastAPI:
                 detail=f"LLM unavailable for query answering. Check Ollama is running at http://localhost:11434. Error: {e}",
             )
 
-        store.save_cached_query(query_hash=query_hash, dataset_id=dataset_id, response=answer)
+        await anyio.to_thread.run_sync(
+            partial(store.save_cached_query, query_hash=query_hash, dataset_id=dataset_id, response=answer)
+        )
         return QueryResponse(
             dataset_id=dataset_id,
             version=version,
@@ -324,23 +482,50 @@ def create_app() -> FastAPI:
             answer=answer,
         )
 
+    @app.post("/query", response_model=QueryResponse)
+    async def query(req: QueryRequest, response: Response) -> Any:
+        return await _query(req, response)
+
+    @app.get("/query", response_model=QueryResponse)
+    async def query_get(
+        dataset_id: str, question: str, request: Request, response: Response, version: Optional[str] = None
+    ) -> Any:
+        """POST /query as a cacheable read: answers 304 when If-None-Match is current."""
+        return await _query(QueryRequest(dataset_id=dataset_id, version=version, question=question), response, request)
+
     @app.post("/compare", response_model=CompareResponse)
-    def compare(req: CompareRequest) -> CompareResponse:
+    async def compare(req: CompareRequest) -> CompareResponse:
         dataset_id = req.dataset_id
         base = store.get_schema(dataset_id, req.base_version)
         comp = store.get_schema(dataset_id, req.compare_version)
         if not base or not comp:
             raise HTTPException(status_code=404, detail="Both schema versions must exist in memory.")
 
-        base_schema = DatasetSchema.from_compressed_json(base.compressed_schema_json)
-        comp_schema = DatasetSchema.from_compressed_json(comp.compressed_schema_json)
+        # Reports depend only on file contents; versions are re-stamped on a hit
+        drift_key = store.stable_hash(f"{base.file_hash}|{comp.file_hash}")
+        cached = store.get_cached_drift(drift_key)
+        if cached:
+            drift_report_dict = dict(
+                cached.report, base_version=req.base_version, compare_version=req.compare_version
+            )
+        else:
+
+            def drift_report() -> Dict[str, Any]:
+                base_schema = _parsed_schema(base)
+                comp_schema = _parsed_schema(comp)
+                report = get_schema_engine().generate_drift_report(
+                    base_schema, comp_schema, base_df=None, compare_df=None
+                )
+                report_dict = asdict(report)
+                store.save_cached_drift(drift_key, report_dict)
+                return report_dict
 
-        report = schema_engine.generate_drift_report(base_schema, comp_schema, base_df=None, compare_df=None)
+            drift_report_dict = await anyio.to_thread.run_sync(drift_report)
         return CompareResponse(
             dataset_id=dataset_id,
             base_version=req.base_version,
             compare_version=req.compare_version,
-            drift_report=asdict(report),
+            drift_report=drift_report_dict,
         )
 
     return app
@@ -348,3 +533,25 @@ def create_app() -> FastAPI:
 
 app = create_app()
 
+
+if __name__ == "__main__":
+    # Production entrypoint: `python -m api.app`. uvloop/httptools are used when
+    # installed (uvicorn[standard]); the asyncio loop and h11 parser otherwise.
+    # Equivalent Gunicorn: gunicorn api.app:app -k uvicorn.workers.UvicornWorker
+    import importlib.util
+
+    import uvicorn
+
+    uvicorn.run(
+        "api.app:app",
+        host=os.getenv("API_HOST", "0.0.0.0"),
+        port=int(os.getenv("API_PORT", "8000")),
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        # Each worker holds its own MemoryStore; only raise this without a shared
+        # MEMORY_STORE_PATH (workers would overwrite each other's file)
+        workers=int(os.getenv("API_WORKERS", "1")),
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
+    )
+
@@ -0,0 +1,207 @@
+"""
+Keep-alive HTTP transport shared by the LLM clients.
+
+`urllib.request.urlopen` opens a fresh TCP (and TLS) connection for every call.
+`KeepAlivePool` instead keeps one persistent `http.client` connection per origin
+and thread, so repeated calls skip DNS, TCP and TLS setup.
+
+Design goals:
+- Stdlib only (same as the clients)
+- Thread-safe: API handlers call the clients from worker threads, and an
+  `http.client` connection must not be shared between threads
+- A stale pooled connection (closed by the server while idle) is retried once on
+  a fresh connection
+- Same reach as urlopen: HTTP(S)_PROXY / NO_PROXY are honored (HTTPS is tunneled
+  with CONNECT) and redirects are followed (301/302/303 re-issued as GET like
+  urllib; 307/308 repeat the POST)
+"""
+
+from __future__ import annotations
+
+import base64
+import http.client
+import threading
+import urllib.request
+from typing import Dict, Iterator, Mapping, Optional, Tuple
+from urllib.parse import unquote, urljoin, urlsplit
+
+
+class HTTPStatusError(Exception):
+    """Non-2xx/3xx response; carries the status, reason and raw body."""
+
+    def __init__(self, status: int, reason: str, body: bytes) -> None:
+        super().__init__(f"HTTP {status}: {reason}")
+        self.status = status
+        self.reason = reason
+        self.body = body
+
+
+# Errors meaning a reused keep-alive connection was already closed by the peer
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+# Same limit as urllib.request.HTTPRedirectHandler
+_MAX_REDIRECTS = 10
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+# Dropped when a redirect turns the request into a bodiless GET
+_CONTENT_HEADERS = frozenset({"content-length", "content-type"})
+
+# (proxy host:port, Proxy-Authorization headers) for one origin
+_Proxy = Tuple[str, Dict[str, str]]
+
+
+def _parse_proxy(proxy_url: str) -> _Proxy:
+    if "://" not in proxy_url:
+        proxy_url = "http://" + proxy_url  # urllib accepts bare host:port too
+    parts = urlsplit(proxy_url)
+    netloc = parts.hostname or ""
+    if parts.port:
+        netloc = f"{netloc}:{parts.port}"
+    headers = {}
+    if parts.username is not None:
+        creds = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        headers["Proxy-Authorization"] = "Basic " + base64.b64encode(creds.encode()).decode("ascii")
+    return netloc, headers
+
+
+class KeepAlivePool:
+    """Per-thread persistent HTTP(S) connections, keyed by (scheme, host:port)."""
+
+    def __init__(self, timeout_seconds: float) -> None:
+        self.timeout_seconds = timeout_seconds
+        self._local = threading.local()
+        # (scheme, host:port) -> proxy or None; the environment is read once per
+        # origin, as urllib's default opener reads it once per process
+        self._proxies: Dict[Tuple[str, str], Optional[_Proxy]] = {}
+
+    def _proxy_for(self, scheme: str, netloc: str) -> Optional[_Proxy]:
+        key = (scheme, netloc)
+        if key not in self._proxies:
+            proxy_url = urllib.request.getproxies().get(scheme)
+            if proxy_url and not urllib.request.proxy_bypass(netloc):
+                self._proxies[key] = _parse_proxy(proxy_url)
+            else:
+                self._proxies[key] = None
+        return self._proxies[key]
+
+    def _connections(self) -> Dict[Tuple[str, str], http.client.HTTPConnection]:
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        return conns
+
+    def _connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        if scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {scheme!r}")
+        proxy = self._proxy_for(scheme, netloc)
+        if proxy is None:
+            conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            return conn_cls(netloc, timeout=self.timeout_seconds)
+        proxy_netloc, proxy_headers = proxy
+        if scheme == "https":
+            # CONNECT tunnel through the proxy; TLS is then negotiated with the origin
+            conn = http.client.HTTPSConnection(proxy_netloc, timeout=self.timeout_seconds)
+            conn.set_tunnel(netloc, headers=proxy_headers)
+            return conn
+        # Plain HTTP: requests go to the proxy with an absolute-form target (see _send_once)
+        return http.client.HTTPConnection(proxy_netloc, timeout=self.timeout_seconds)
+
+    def _drop(self, key: Tuple[str, str], conn: http.client.HTTPConnection) -> None:
+        conns = self._connections()
+        if conns.get(key) is conn:
+            del conns[key]
+        conn.close()
+
+    def _send(
+        self, url: str, body: bytes, headers: Mapping[str, str]
+    ) -> Tuple[Tuple[str, str], http.client.HTTPConnection, http.client.HTTPResponse]:
+        # POST, following redirects; returns the final response (body left unread)
+        method: str = "POST"
+        payload: Optional[bytes] = body
+        for _ in range(_MAX_REDIRECTS + 1):
+            key, conn, resp = self._send_once(method, url, payload, headers)
+            location = resp.getheader("Location")
+            if resp.status not in _REDIRECT_STATUSES or not location:
+                return key, conn, resp
+            # Drain so the connection can be reused for the next hop
+            resp.read()
+            if resp.will_close:
+                self._drop(key, conn)
+            url = urljoin(url, location)
+            if resp.status in (301, 302, 303):
+                # urllib semantics: the redirected request is a GET without the body
+                method, payload = "GET", None
+                headers = {k: v for k, v in headers.items() if k.lower() not in _CONTENT_HEADERS}
+        raise HTTPStatusError(resp.status, "Too many redirects", b"")
+
+    def _send_once(
+        self, method: str, url: str, body: Optional[bytes], headers: Mapping[str, str]
+    ) -> Tuple[Tuple[str, str], http.client.HTTPConnection, http.client.HTTPResponse]:
+        # Send one request and read the status line/headers (body left unread)
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        request_headers = dict(headers)
+        proxy = self._proxy_for(*key) if parts.scheme == "http" else None
+        if proxy is not None:
+            path = f"http://{parts.netloc}{path}"  # absolute-form target for the proxy
+            request_headers.update(proxy[1])
+        conns = self._connections()
+
+        for attempt in range(2):
+            conn = conns.get(key)
+            reused = conn is not None
+            if conn is None:
+                conn = conns[key] = self._connect(*key)
+            try:
+                conn.request(method, path, body=body, headers=request_headers)
+                resp = conn.getresponse()
+            except _STALE_CONNECTION_ERRORS:
+                self._drop(key, conn)
+                if reused and attempt == 0:
+                    continue  # Idle connection was dropped by the server; retry on a fresh one
+                raise
+            except BaseException:
+                self._drop(key, conn)
+                raise
+            if resp.status >= 400:
+                data = resp.read()
+                if resp.will_close:
+                    self._drop(key, conn)
+                raise HTTPStatusError(resp.status, resp.reason, data)
+            return key, conn, resp
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def post(self, url: str, body: bytes, headers: Mapping[str, str]) -> bytes:
+        """
+        POST `body` to `url` over a pooled connection and return the response body.
+
+        Raises:
+            HTTPStatusError: The server answered with status >= 400
+            OSError: Connection could not be established (or timed out)
+        """
+        key, conn, resp = self._send(url, body, headers)
+        try:
+            data = resp.read()
+        except BaseException:
+            self._drop(key, conn)
+            raise
+        if resp.will_close:
+            self._drop(key, conn)
+        return data
+
+    def post_lines(self, url: str, body: bytes, headers: Mapping[str, str]) -> Iterator[bytes]:
+        """
+        POST like `post`, but yield the response body line by line as it arrives.
+
+        For streaming (e.g. NDJSON) responses. The connection goes back to the pool
+        only if the body is read to the end; a generator closed early drops it.
+        """
+        key, conn, resp = self._send(url, body, headers)
+        finished = False
+        try:
+            for line in resp:
+                yield line
+            finished = True
+        finally:
+            if not finished or resp.will_close:
+                self._drop(key, conn)
@@ -5,9 +5,10 @@ Implements the `LLMClient` Protocol defined in `reasoning/insight_reasoner.py`.
 
 Design goals:
 - Minimal, explicit HTTP calls to local Ollama
-- No external dependencies beyond stdlib
+- Keep-alive connection reused across calls (see llm/_http.py)
+- No required dependencies beyond stdlib (orjson is used when installed)
 - Model: llama3.1:8b (fully local, no API keys)
-- complete(prompt) -> str
+- complete(prompt) -> str (streamed from Ollama, assembled client-side)
 - No embeddings (optional in Protocol)
 
 Environment variables:
@@ -18,18 +19,35 @@ Environment variables:
 
 from __future__ import annotations
 
+import io
 import json
 import os
-import urllib.error
-import urllib.request
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+try:  # optional dependency: faster JSON encoding/decoding of request/stream bodies
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+from llm._http import HTTPStatusError, KeepAlivePool
 
 
 class OllamaClientError(RuntimeError):
     """Raised when the Ollama client cannot complete a request successfully."""
 
 
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    # Compact UTF-8 JSON bytes, ready to send
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+# Both accept bytes directly; orjson.JSONDecodeError subclasses json.JSONDecodeError
+_loads = orjson.loads if orjson is not None else json.loads
+
+
 def _env(name: str, default: Optional[str] = None) -> Optional[str]:
     v = os.getenv(name)
     if v is None or v == "":
@@ -37,13 +55,23 @@ def _env(name: str, default: Optional[str] = None) -> Optional[str]:
     return v
 
 
-@dataclass
+@dataclass(frozen=True)
 class OllamaClientConfig:
     base_url: str = "http://localhost:11434"
     model: str = "llama3.1:8b"
     timeout_seconds: int = 120
 
 
+def _default_ollama_config() -> OllamaClientConfig:
+    # Environment is read per client, so a changed variable takes effect; the config
+    # is frozen (use dataclasses.replace for per-client overrides).
+    return OllamaClientConfig(
+        base_url=_env("OLLAMA_BASE_URL", "http://localhost:11434") or "http://localhost:11434",
+        model=_env("OLLAMA_MODEL", "llama3.1:8b") or "llama3.1:8b",
+        timeout_seconds=int(_env("OLLAMA_TIMEOUT_SECONDS", "120") or "120"),
+    )
+
+
 class OllamaLLMClient:
     """
     Local Ollama LLM client.
@@ -55,12 +83,9 @@ class OllamaLLMClient:
 
     def __init__(self, config: Optional[OllamaClientConfig] = None) -> None:
         if config is None:
-            config = OllamaClientConfig(
-                base_url=_env("OLLAMA_BASE_URL", "http://localhost:11434") or "http://localhost:11434",
-                model=_env("OLLAMA_MODEL", "llama3.1:8b") or "llama3.1:8b",
-                timeout_seconds=int(_env("OLLAMA_TIMEOUT_SECONDS", "120") or "120"),
-            )
+            config = _default_ollama_config()
         self.config = config
+        self._pool = KeepAlivePool(timeout_seconds=config.timeout_seconds)
 
     # ---- Public API (matches reasoning.insight_reasoner.LLMClient Protocol) ----
 
@@ -68,6 +93,9 @@ class OllamaLLMClient:
         """
         Execute a completion call against local Ollama.
 
+        The response is streamed (see `stream_complete`) and assembled as tokens
+        arrive, rather than buffered by Ollama until generation finishes.
+
         Args:
             prompt: Full prompt text
             temperature: Sampling temperature (0.0 = deterministic, 1.0 = creative)
@@ -75,46 +103,63 @@ class OllamaLLMClient:
         Returns:
             Generated response string
         """
+        buf = io.StringIO()
+        for token in self.stream_complete(prompt=prompt, temperature=temperature):
+            buf.write(token)
+        response_text = buf.getvalue().strip()
+        if not response_text:
+            raise OllamaClientError("Empty response from Ollama")
+        return response_text
+
+    def stream_complete(self, *, prompt: str, temperature: float = 0.2) -> Iterator[str]:
+        """
+        Yield response fragments as Ollama generates them (NDJSON stream).
+
+        Suitable for feeding a streaming HTTP response; `complete` joins them.
+
+        Args:
+            prompt: Full prompt text
+            temperature: Sampling temperature (0.0 = deterministic, 1.0 = creative)
+        """
         url = f"{self.config.base_url.rstrip('/')}/api/generate"
         payload: Dict[str, Any] = {
             "model": self.config.model,
             "prompt": prompt,
             "temperature": float(temperature),
-            "stream": False,  # Wait for complete response
+            "stream": True,  # One JSON object per line as tokens are generated
         }
 
         try:
-            body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
-            req = urllib.request.Request(
-                url=url,
-                data=body,
-                method="POST",
+            body = _dumps(payload)
+            lines = self._pool.post_lines(
+                url,
+                body,
                 headers={
                     "Content-Type": "application/json",
-                    "Accept": "application/json",
+                    "Accept": "application/x-ndjson",
                 },
             )
-
-            with urllib.request.urlopen(req, timeout=self.config.timeout_seconds) as resp:
-                raw = resp.read().decode("utf-8")
+            # Read to the end of the stream (the "done" object is the last line) so
+            # the keep-alive connection can be reused
+            for line in lines:
+                if not line.strip():
+                    continue
                 try:
-                    data = json.loads(raw) if raw.strip() else {}
+                    chunk = _loads(line)
                 except json.JSONDecodeError as je:
                     raise OllamaClientError(f"Non-JSON response from Ollama: {je}") from je
-
-                response_text = data.get("response", "").strip()
-                if not response_text:
-                    raise OllamaClientError("Empty response from Ollama")
-                return response_text
-
-        except urllib.error.HTTPError as e:
-            detail = ""
-            try:
-                detail = e.read().decode("utf-8")
-            except Exception:
-                pass
-            raise OllamaClientError(f"HTTP {e.code} from Ollama: {detail or e.reason}") from e
-        except urllib.error.URLError as e:
+                if chunk.get("error"):
+                    raise OllamaClientError(f"Ollama error: {chunk['error']}")
+                token = chunk.get("response", "")
+                if token:
+                    yield token
+
+        except OllamaClientError:
+            raise
+        except HTTPStatusError as e:
+            detail = e.body.decode("utf-8", errors="replace")
+            raise OllamaClientError(f"HTTP {e.status} from Ollama: {detail or e.reason}") from e
+        except OSError as e:
             raise OllamaClientError(
                 f"Cannot connect to Ollama at {url}. Ensure Ollama is running. Error: {e}"
             ) from e
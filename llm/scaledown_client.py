@@ -5,9 +5,11 @@ ONLY for prompt compression, NOT for answer generation.
 
 Design goals:
 - Minimal, explicit: compress(text) -> compressed_text
+- compress_many(texts) runs several compressions concurrently
 - Endpoint: https://api.scaledown.xyz/compress/raw/
 - Header: x-api-key
 - Reduces token count without generating answers
+- Keep-alive connection reused across calls (see llm/_http.py)
 
 Environment variables:
 - SCALEDOWN_API_KEY (required)
@@ -24,11 +26,13 @@ from __future__ import annotations
 
 import json
 import os
-import urllib.error
-import urllib.request
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Sequence
 
+from llm._http import HTTPStatusError, KeepAlivePool
+
 
 class ScaledownClientError(RuntimeError):
     """Raised when the Scaledown client cannot complete a request successfully."""
@@ -41,13 +45,26 @@ def _env(name: str, default: Optional[str] = None) -> Optional[str]:
     return v
 
 
-@dataclass
+@dataclass(frozen=True)
 class ScaledownClientConfig:
     api_key: str
     base_url: str = "https://api.scaledown.xyz"
     timeout_seconds: int = 30
 
 
+def _default_scaledown_config() -> ScaledownClientConfig:
+    # Environment is read per client, so a rotated key takes effect; the config is
+    # frozen (use dataclasses.replace for per-client overrides).
+    api_key = _env("SCALEDOWN_API_KEY")
+    if not api_key:
+        raise ScaledownClientError("Missing env var SCALEDOWN_API_KEY")
+    return ScaledownClientConfig(
+        api_key=api_key,
+        base_url=_env("SCALEDOWN_BASE_URL", "https://api.scaledown.xyz") or "https://api.scaledown.xyz",
+        timeout_seconds=int(_env("SCALEDOWN_TIMEOUT_SECONDS", "30") or "30"),
+    )
+
+
 class ScaledownCompressionClient:
     """
     Compress prompts using ScaleDown API.
@@ -58,15 +75,13 @@ class ScaledownCompressionClient:
 
     def __init__(self, config: Optional[ScaledownClientConfig] = None) -> None:
         if config is None:
-            api_key = _env("SCALEDOWN_API_KEY")
-            if not api_key:
-                raise ScaledownClientError("Missing env var SCALEDOWN_API_KEY")
-            config = ScaledownClientConfig(
-                api_key=api_key,
-                base_url=_env("SCALEDOWN_BASE_URL", "https://api.scaledown.xyz") or "https://api.scaledown.xyz",
-                timeout_seconds=int(_env("SCALEDOWN_TIMEOUT_SECONDS", "30") or "30"),
-            )
+            config = _default_scaledown_config()
         self.config = config
+        self._pool = KeepAlivePool(timeout_seconds=config.timeout_seconds)
+        # Created on first compress_many; its long-lived threads keep their
+        # keep-alive connections between batches
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
 
     def compress(self, prompt: str) -> str:
         """
@@ -82,32 +97,63 @@ class ScaledownCompressionClient:
 
         try:
             body = prompt.encode("utf-8")
-            req = urllib.request.Request(
-                url=url,
-                data=body,
-                method="POST",
+            compressed = self._pool.post(
+                url,
+                body,
                 headers={
                     "x-api-key": self.config.api_key,
                     "Content-Type": "text/plain",
                     "Accept": "text/plain",
                 },
-            )
-
-            with urllib.request.urlopen(req, timeout=self.config.timeout_seconds) as resp:
-                compressed = resp.read().decode("utf-8").strip()
-                if not compressed:
-                    raise ScaledownClientError("Empty response from ScaleDown compression")
-                return compressed
-
-        except urllib.error.HTTPError as e:
-            detail = ""
-            try:
-                detail = e.read().decode("utf-8")
-            except Exception:
-                pass
-            raise ScaledownClientError(f"HTTP {e.code} from ScaleDown: {detail or e.reason}") from e
-        except urllib.error.URLError as e:
+            ).decode("utf-8").strip()
+            if not compressed:
+                raise ScaledownClientError("Empty response from ScaleDown compression")
+            return compressed
+
+        except HTTPStatusError as e:
+            detail = e.body.decode("utf-8", errors="replace")
+            raise ScaledownClientError(f"HTTP {e.status} from ScaleDown: {detail or e.reason}") from e
+        except OSError as e:
             raise ScaledownClientError(f"Cannot connect to ScaleDown. Error: {e}") from e
         except Exception as e:
             raise ScaledownClientError(f"Error calling ScaleDown compression: {e}") from e
 
+    def compress_many(self, prompts: Sequence[str], max_concurrency: int = 4) -> List[str]:
+        """
+        Compress several prompts, overlapping their round trips.
+
+        The compression endpoint takes one raw prompt per request, so prompts are
+        sent concurrently from a small persistent thread pool, each thread on its
+        own keep-alive connection.
+
+        Args:
+            prompts: Prompt texts
+            max_concurrency: Maximum requests in flight (fixed when the pool is first created)
+
+        Returns:
+            Compressed prompts, in input order
+
+        Raises:
+            ScaledownClientError: If any prompt fails to compress
+        """
+        if len(prompts) <= 1:
+            return [self.compress(p) for p in prompts]
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(1, int(max_concurrency)), thread_name_prefix="scaledown"
+                )
+        return list(self._executor.map(self.compress, prompts))
+
+    def close(self) -> None:
+        """Shut down the compress_many thread pool (a later call creates a new one)."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ScaledownCompressionClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
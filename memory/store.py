@@ -13,17 +13,56 @@ Why this matters (and why it makes this an AI agent, not a script):
 Design constraints:
 - No LLM usage here
 - No recomputation here
-- Dict-backed in-memory store first, with optional JSON persistence to disk
+- Dict-backed in-memory store first, with optional persistence to disk
+  (JSON snapshot plus an append-only JSONL log of mutations)
 """
 
 from __future__ import annotations
 
+import bisect
 import hashlib
 import json
-from dataclasses import asdict, dataclass
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, fields
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from analysis.hashing import file_hash_scheme, normalize_file_hash
+
+try:  # optional dependency: fast non-cryptographic hashing for cache keys
+    import xxhash
+except ImportError:  # pragma: no cover - depends on environment
+    xxhash = None
+
+try:  # optional dependency: faster JSON for the snapshot and log
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+
+def _dumps_bytes(obj: Any) -> bytes:
+    """Compact UTF-8 JSON (non-ASCII kept), encoded straight to bytes by orjson."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+try:  # optional dependency: streaming parse of large snapshots
+    import ijson
+except ImportError:  # pragma: no cover - depends on environment
+    ijson = None
+
+
+def _ns_to_iso(ns: int) -> str:
+    """Local-time ISO string, as `datetime.now().isoformat()` would have produced."""
+    seconds, rem = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=rem // 1000).isoformat()
 
 
 # -----------------------------
@@ -31,7 +70,7 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 # -----------------------------
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StoredSchema:
     dataset_id: str
     version: str
@@ -39,15 +78,24 @@ class StoredSchema:
     compressed_schema_json: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StoredAnalysis:
     dataset_id: str
     version: str
     analysis_result: str  # compressed AnalysisResult JSON
-    created_at: str
+    created_at_ns: int  # epoch nanoseconds
+
+    @property
+    def created_at_iso(self) -> str:
+        return _ns_to_iso(self.created_at_ns)
 
+    @property
+    def created_at(self) -> str:
+        """ISO timestamp, as this attribute held before `created_at_ns` was stored."""
+        return self.created_at_iso
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class StoredInsight:
     """
     Placeholder for synthesized insights (full insight reasoning lives elsewhere).
@@ -66,12 +114,126 @@ class StoredInsight:
     semantic_hash: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class QueryCacheEntry:
     query_hash: str
     dataset_id: str
     response: str
-    created_at: str
+    created_at_ns: int  # epoch nanoseconds
+
+    @property
+    def created_at_iso(self) -> str:
+        return _ns_to_iso(self.created_at_ns)
+
+    @property
+    def created_at(self) -> str:
+        """ISO timestamp, as this attribute held before `created_at_ns` was stored."""
+        return self.created_at_iso
+
+
+@dataclass(frozen=True, slots=True)
+class DriftCacheEntry:
+    """
+    A computed drift report (`asdict(DriftReport)`), keyed by the two file hashes.
+
+    Schemas are immutable per file content, so the report is fully determined by
+    the (base, compare) file hash pair.
+    """
+
+    drift_key: str
+    report: Dict[str, Any]
+    created_at_ns: int  # epoch nanoseconds
+
+    @property
+    def created_at_iso(self) -> str:
+        return _ns_to_iso(self.created_at_ns)
+
+    @property
+    def created_at(self) -> str:
+        """ISO timestamp, as this attribute held before `created_at_ns` was stored."""
+        return self.created_at_iso
+
+
+# Field names per record type, computed once: `_save` serializes with these instead
+# of `dataclasses.asdict`, which re-inspects fields and deep-copies every value.
+# Records are frozen and never mutated after saving, so sharing values is safe.
+_SCHEMA_FIELDS = tuple(f.name for f in fields(StoredSchema))
+_ANALYSIS_FIELDS = tuple(f.name for f in fields(StoredAnalysis))
+_INSIGHT_FIELDS = tuple(f.name for f in fields(StoredInsight))
+_QUERY_CACHE_FIELDS = tuple(f.name for f in fields(QueryCacheEntry))
+_DRIFT_CACHE_FIELDS = tuple(f.name for f in fields(DriftCacheEntry))
+
+
+def _fast_asdict(obj: Any, names: Tuple[str, ...]) -> Dict[str, Any]:
+    """Shallow `asdict` for flat records."""
+    return {n: getattr(obj, n) for n in names}
+
+
+# Append-log record type tags -> (record class, field names)
+_LOG_RECORD_TYPES: Dict[str, Tuple[type, Tuple[str, ...]]] = {
+    "schema": (StoredSchema, _SCHEMA_FIELDS),
+    "analysis": (StoredAnalysis, _ANALYSIS_FIELDS),
+    "insight": (StoredInsight, _INSIGHT_FIELDS),
+    "query": (QueryCacheEntry, _QUERY_CACHE_FIELDS),
+    "drift": (DriftCacheEntry, _DRIFT_CACHE_FIELDS),
+}
+
+# Log lines after which a flush folds the log into a fresh snapshot
+_COMPACT_LOG_LINES = 10_000
+
+
+# Snapshot sections, in the order `_save` writes them
+_SNAPSHOT_SECTIONS = ("schemas", "analyses", "insights", "query_cache", "drift_cache")
+
+
+def _iter_snapshot(path: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yield (section, record dict) from a snapshot file.
+
+    With ijson, records are built one at a time from the parse events, so only
+    one record is materialized at once instead of the raw file plus the whole
+    decoded payload.
+    """
+    with path.open("rb") as f:
+        if ijson is None:
+            raw = f.read()
+            payload = _loads(raw) if raw.strip() else {}
+            for section in _SNAPSHOT_SECTIONS:
+                for item in payload.get(section, []):
+                    yield section, item
+            return
+
+        builder = None
+        section = ""
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if builder is None:
+                # A record is a map directly inside one of the section arrays
+                if event == "start_map" and prefix.endswith(".item") and prefix[:-5] in _SNAPSHOT_SECTIONS:
+                    section = prefix[:-5]
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                continue
+            builder.event(event, value)
+            if event == "end_map" and prefix == section + ".item":
+                yield section, builder.value
+                builder = None
+
+
+def _upgrade_created_at(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a record persisted before `created_at_ns` (ISO `created_at`) in place."""
+    iso = item.pop("created_at", None)
+    if iso is not None:
+        dt = datetime.fromisoformat(iso)
+        item["created_at_ns"] = int(dt.replace(microsecond=0).timestamp()) * 1_000_000_000 + dt.microsecond * 1000
+    return item
+
+
+def _intern_ids(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Intern a loaded record's dataset_id/version in place (see `MemoryStore` key notes)."""
+    for name in ("dataset_id", "version"):
+        if name in item:
+            item[name] = sys.intern(item[name])
+    return item
 
 
 # -----------------------------
@@ -85,29 +247,76 @@ class MemoryStore:
 
     Core principle: consumers must check memory BEFORE recomputation.
     This store never performs analysis or reasoning; it only saves/retrieves.
+    Mutations and persistence are serialized by one lock, so API worker threads
+    may call save_* and flush() concurrently.
     """
 
-    def __init__(self, persist_path: Optional[Union[str, Path]] = None) -> None:
+    def __init__(
+        self,
+        persist_path: Optional[Union[str, Path]] = None,
+        persist_mode: str = "batched",
+        batch_threshold: int = 64,
+        bytes_per_sync: int = 1 << 20,
+    ) -> None:
         """
         Args:
-            persist_path: Optional path to a JSON file to persist store contents.
-                          If provided and file exists, it is loaded at startup.
+            persist_path: Optional path to a JSON snapshot file. Mutations are
+                          appended to a JSONL log next to it (same name, ".jsonl"
+                          suffix) and folded into the snapshot by `compact()`.
+                          If either file exists, it is loaded at startup.
+            persist_mode: "immediate" appends to the log after every mutation;
+                          "batched" appends once per `batch_threshold` mutations,
+                          on `flush()`, when leaving a `with store:` block, and when
+                          the store is garbage collected.
+            batch_threshold: Pending mutations that trigger a write in batched mode.
+            bytes_per_sync: Log bytes appended between fsyncs. Appends in between
+                            survive a process crash but not an OS crash; snapshots
+                            written by `compact()` are always fsynced.
         """
+        if persist_mode not in ("batched", "immediate"):
+            raise ValueError(f"Unknown persist_mode: {persist_mode!r}")
         self.persist_path = Path(persist_path) if persist_path else None
-
-        # Primary indexes
+        self._log_path: Optional[Path] = None
+        if self.persist_path:
+            self._log_path = self.persist_path.with_suffix(".jsonl")
+            if self._log_path == self.persist_path:
+                self._log_path = self.persist_path.with_suffix(".log.jsonl")
+        self.persist_mode = persist_mode
+        self.batch_threshold = max(1, int(batch_threshold))
+        # (type tag, record) mutations not yet appended to the log
+        self._pending: List[Tuple[str, Any]] = []
+        # Lines in the log file (replayed on load; triggers compaction)
+        self._log_lines = 0
+        self.bytes_per_sync = max(1, int(bytes_per_sync))
+        self._bytes_since_sync = 0
+        # Guards the indexes, _pending and the log/snapshot files. Reentrant:
+        # flush() may compact() while holding it.
+        self._lock = threading.RLock()
+
+        # Primary indexes. dataset_id/version strings in stored keys are interned:
+        # they repeat across every index, so entries share one object per value and
+        # key equality checks between stored keys short-circuit on identity.
         self._schemas: Dict[Tuple[str, str], StoredSchema] = {}
+        # dataset_id -> sorted versions (kept in step with _schemas)
+        self._versions_by_dataset: Dict[str, List[str]] = {}
+        # (dataset_id, normalized file_hash) -> first version (sorted) holding that file
+        self._hash_index: Dict[Tuple[str, str], str] = {}
         self._analyses: Dict[Tuple[str, str], StoredAnalysis] = {}
 
         # Insights: list per dataset, plus semantic index for dedup
         self._insights_by_dataset: Dict[str, List[StoredInsight]] = {}
         self._insight_semantic_index: Dict[Tuple[str, str], str] = {}
         # key: (dataset_id, semantic_hash) -> insight_id
+        self._insights_by_version: Dict[Tuple[str, str], List[StoredInsight]] = {}
+        # key: (dataset_id, version) -> insights of that version (insertion order)
 
         # Query cache: (dataset_id, query_hash) -> entry
         self._query_cache: Dict[Tuple[str, str], QueryCacheEntry] = {}
 
-        if self.persist_path and self.persist_path.exists():
+        # Drift cache: drift_key -> entry
+        self._drift_cache: Dict[str, DriftCacheEntry] = {}
+
+        if self.persist_path and (self.persist_path.exists() or self._log_path.exists()):
             self._load()
 
     # -----------------------------
@@ -116,8 +325,17 @@ class MemoryStore:
 
     @staticmethod
     def stable_hash(text: str) -> str:
-        """Deterministic SHA256 of a UTF-8 string (useful for query hashing)."""
-        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+        """
+        Deterministic 64-bit hex digest of a UTF-8 string (useful for query hashing).
+
+        Keys only need to be stable, not cryptographic: xxh3_64 when xxhash is
+        installed, 64-bit BLAKE2b otherwise. The two differ, so a persisted store
+        moved between environments just misses its cached keys.
+        """
+        data = text.encode("utf-8")
+        if xxhash is not None:
+            return xxhash.xxh3_64_hexdigest(data)
+        return hashlib.blake2b(data, digest_size=8).hexdigest()
 
     # -----------------------------
     # Schemas
@@ -125,19 +343,54 @@ class MemoryStore:
 
     def save_schema(self, schema: StoredSchema) -> None:
         """Persist a compressed schema for a given dataset/version."""
-        key = (schema.dataset_id, schema.version)
-        self._schemas[key] = schema
+        with self._lock:
+            self._index_schema(schema)
+            self._log_record("schema", schema)
         self._persist_if_enabled()
 
+    def _index_schema(self, schema: StoredSchema) -> None:
+        dataset_id, version = sys.intern(schema.dataset_id), sys.intern(schema.version)
+        key = (dataset_id, version)
+        previous = self._schemas.get(key)
+        if previous is None:
+            bisect.insort(self._versions_by_dataset.setdefault(dataset_id, []), version)
+        self._schemas[key] = schema
+        if previous is not None and previous.file_hash != schema.file_hash:
+            self._reindex_hash(dataset_id, normalize_file_hash(previous.file_hash))
+        self._reindex_hash(dataset_id, normalize_file_hash(schema.file_hash))
+
     def get_schema(self, dataset_id: str, version: str) -> Optional[StoredSchema]:
         """Retrieve stored schema, or None if not present."""
         return self._schemas.get((dataset_id, version))
 
+    def find_version_by_hash(self, dataset_id: str, file_hash: str) -> Optional[str]:
+        """
+        First version (sorted) of dataset_id whose schema has this file_hash, or None.
+
+        Hashes are compared in normalized form (legacy bare digests are SHA-256), so
+        only digests of the same scheme can match; see `has_hash_scheme`.
+        """
+        return self._hash_index.get((dataset_id, normalize_file_hash(file_hash)))
+
+    def has_hash_scheme(self, dataset_id: str, scheme: str) -> bool:
+        """Whether any stored schema of dataset_id has a file_hash of this scheme."""
+        return any(
+            file_hash_scheme(self._schemas[(dataset_id, v)].file_hash) == scheme
+            for v in self._versions_by_dataset.get(dataset_id, ())
+        )
+
+    def _reindex_hash(self, dataset_id: str, file_hash: str) -> None:
+        # Recompute one (dataset_id, normalized file_hash) entry from the sorted versions
+        for v in self._versions_by_dataset.get(dataset_id, ()):
+            if normalize_file_hash(self._schemas[(dataset_id, v)].file_hash) == file_hash:
+                self._hash_index[(dataset_id, file_hash)] = v
+                return
+        self._hash_index.pop((dataset_id, file_hash), None)
+
     def list_versions(self, dataset_id: str) -> List[str]:
         """List known versions for a dataset_id (sorted lexicographically)."""
-        versions = [v for (ds, v) in self._schemas.keys() if ds == dataset_id]
-        versions.sort()
-        return versions
+        # Copy: callers may sort/mutate the result
+        return list(self._versions_by_dataset.get(dataset_id, ()))
 
     # -----------------------------
     # Analyses (EDA signals)
@@ -145,8 +398,10 @@ class MemoryStore:
 
     def save_analysis(self, analysis: StoredAnalysis) -> None:
         """Persist compressed analysis results for a dataset/version."""
-        key = (analysis.dataset_id, analysis.version)
-        self._analyses[key] = analysis
+        key = (sys.intern(analysis.dataset_id), sys.intern(analysis.version))
+        with self._lock:
+            self._analyses[key] = analysis
+            self._log_record("analysis", analysis)
         self._persist_if_enabled()
 
     def get_analysis(self, dataset_id: str, version: str) -> Optional[StoredAnalysis]:
@@ -173,17 +428,45 @@ class MemoryStore:
         Merging/normalization belongs in the insight reasoner.
         """
         key = (insight.dataset_id, insight.semantic_hash)
-        if key in self._insight_semantic_index:
-            return  # deterministic no-op
+        with self._lock:
+            if key in self._insight_semantic_index:
+                return  # deterministic no-op
 
-        self._insight_semantic_index[key] = insight.insight_id
-        self._insights_by_dataset.setdefault(insight.dataset_id, []).append(insight)
+            self._index_insight(insight)
+            self._log_record("insight", insight)
         self._persist_if_enabled()
 
+    def save_insights(self, insights: List[StoredInsight]) -> None:
+        """
+        Save several insights with the same per-insight dedup as `save_insight`,
+        persisting the store once for the whole batch.
+        """
+        added = False
+        with self._lock:
+            for insight in insights:
+                key = (insight.dataset_id, insight.semantic_hash)
+                if key in self._insight_semantic_index:
+                    continue  # deterministic no-op
+                self._index_insight(insight)
+                self._log_record("insight", insight)
+                added = True
+        if added:
+            self._persist_if_enabled()
+
+    def _index_insight(self, insight: StoredInsight) -> None:
+        dataset_id, version = sys.intern(insight.dataset_id), sys.intern(insight.version)
+        self._insight_semantic_index[(dataset_id, insight.semantic_hash)] = insight.insight_id
+        self._insights_by_dataset.setdefault(dataset_id, []).append(insight)
+        self._insights_by_version.setdefault((dataset_id, version), []).append(insight)
+
     def list_insights(self, dataset_id: str) -> List[StoredInsight]:
         """Return all stored insights for a dataset (in insertion order)."""
         return list(self._insights_by_dataset.get(dataset_id, []))
 
+    def list_insights_for_version(self, dataset_id: str, version: str) -> List[StoredInsight]:
+        """Return the stored insights of one dataset version (in insertion order)."""
+        return list(self._insights_by_version.get((dataset_id, version), []))
+
     # -----------------------------
     # Query cache (natural language answers)
     # -----------------------------
@@ -198,64 +481,198 @@ class MemoryStore:
             query_hash=str(query_hash),
             dataset_id=str(dataset_id),
             response=str(response),
-            created_at=datetime.now().isoformat(),
+            created_at_ns=time.time_ns(),
         )
-        self._query_cache[(dataset_id, query_hash)] = entry
+        with self._lock:
+            self._query_cache[(sys.intern(entry.dataset_id), entry.query_hash)] = entry
+            self._log_record("query", entry)
+        self._persist_if_enabled()
+
+    # -----------------------------
+    # Drift cache (schema comparisons)
+    # -----------------------------
+
+    def get_cached_drift(self, drift_key: str) -> Optional[DriftCacheEntry]:
+        """Retrieve a cached drift report by key (see `save_cached_drift`)."""
+        return self._drift_cache.get(drift_key)
+
+    def save_cached_drift(self, drift_key: str, report: Dict[str, Any]) -> None:
+        """
+        Store a drift report deterministically.
+
+        Callers key it as `stable_hash(f"{base.file_hash}|{compare.file_hash}")`.
+        """
+        entry = DriftCacheEntry(
+            drift_key=str(drift_key),
+            report=dict(report),
+            created_at_ns=time.time_ns(),
+        )
+        with self._lock:
+            self._drift_cache[entry.drift_key] = entry
+            self._log_record("drift", entry)
         self._persist_if_enabled()
 
     # -----------------------------
     # Persistence (optional, minimal)
     # -----------------------------
 
-    def _persist_if_enabled(self) -> None:
+    def _log_record(self, type_tag: str, record: Any) -> None:
+        # Caller holds self._lock (same critical section as the index update)
         if self.persist_path:
+            self._pending.append((type_tag, record))
+
+    def _persist_if_enabled(self) -> None:
+        if self.persist_mode == "immediate" or len(self._pending) >= self.batch_threshold:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Append pending mutations to the log in one write (no-op when nothing is
+        pending), compacting once the log grows past `_COMPACT_LOG_LINES`.
+        """
+        if not self.persist_path:
+            return
+        # The write stays under the lock too: batches must reach the log in the
+        # order they were recorded, and never while compact() swaps the files.
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            lines = b"".join(
+                _dumps_bytes({"type": tag, "data": _fast_asdict(record, _LOG_RECORD_TYPES[tag][1])}) + b"\n"
+                for tag, record in pending
+            )
+            self._log_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._log_path.open("ab") as f:
+                f.write(lines)
+                self._bytes_since_sync += len(lines)
+                if self._bytes_since_sync >= self.bytes_per_sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self._bytes_since_sync = 0
+            self._log_lines += len(pending)
+            if self._log_lines >= _COMPACT_LOG_LINES:
+                self.compact()
+
+    def compact(self) -> None:
+        """
+        Rewrite the snapshot from memory and truncate the log.
+
+        Crash-safe in either order: replaying a log over a snapshot that already
+        contains its records is idempotent.
+        """
+        if not self.persist_path:
+            return
+        with self._lock:
             self._save()
+            # Pending records are already indexed, so the snapshot holds them
+            self._pending = []
+            self._log_path.unlink(missing_ok=True)
+            self._log_lines = 0
+            self._bytes_since_sync = 0
+
+    def __enter__(self) -> "MemoryStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.flush()
+
+    def __del__(self) -> None:
+        # Best-effort: attributes may be missing if __init__ failed
+        try:
+            self.flush()
+        except Exception:
+            pass
 
     def _save(self) -> None:
         """
         Save the entire store to a single JSON file.
 
         This is intentionally minimal (not a DB) and deterministic in structure.
+        Caller holds self._lock, so no index changes size mid-iteration.
         """
         payload: Dict[str, Any] = {
-            "schemas": [asdict(v) for v in self._schemas.values()],
-            "analyses": [asdict(v) for v in self._analyses.values()],
-            "insights": [asdict(v) for v in self._flatten_insights()],
-            "query_cache": [asdict(v) for v in self._query_cache.values()],
+            "schemas": [_fast_asdict(v, _SCHEMA_FIELDS) for v in self._schemas.values()],
+            "analyses": [_fast_asdict(v, _ANALYSIS_FIELDS) for v in self._analyses.values()],
+            "insights": [_fast_asdict(v, _INSIGHT_FIELDS) for v in self._flatten_insights()],
+            "query_cache": [_fast_asdict(v, _QUERY_CACHE_FIELDS) for v in self._query_cache.values()],
+            "drift_cache": [_fast_asdict(v, _DRIFT_CACHE_FIELDS) for v in self._drift_cache.values()],
         }
 
         self.persist_path.parent.mkdir(parents=True, exist_ok=True)
         tmp = self.persist_path.with_suffix(self.persist_path.suffix + ".tmp")
-        tmp.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
-        tmp.replace(self.persist_path)
+        with tmp.open("wb") as f:
+            f.write(_dumps_bytes(payload))
+            f.flush()
+            # Durable before the rename: compact() deletes the log right after
+            os.fsync(f.fileno())
+        os.replace(tmp, self.persist_path)
 
     def _load(self) -> None:
-        """Load store contents from disk (best-effort, deterministic)."""
-        raw = self.persist_path.read_text(encoding="utf-8")
-        payload = json.loads(raw) if raw.strip() else {}
-
+        """Load the snapshot, then replay the log over it (best-effort, deterministic)."""
         self._schemas.clear()
+        self._versions_by_dataset.clear()
+        self._hash_index.clear()
         self._analyses.clear()
         self._insights_by_dataset.clear()
         self._insight_semantic_index.clear()
+        self._insights_by_version.clear()
         self._query_cache.clear()
-
-        for item in payload.get("schemas", []):
-            s = StoredSchema(**item)
-            self._schemas[(s.dataset_id, s.version)] = s
-
-        for item in payload.get("analyses", []):
-            a = StoredAnalysis(**item)
-            self._analyses[(a.dataset_id, a.version)] = a
-
-        for item in payload.get("insights", []):
-            ins = StoredInsight(**item)
-            self._insights_by_dataset.setdefault(ins.dataset_id, []).append(ins)
-            self._insight_semantic_index[(ins.dataset_id, ins.semantic_hash)] = ins.insight_id
-
-        for item in payload.get("query_cache", []):
-            q = QueryCacheEntry(**item)
-            self._query_cache[(q.dataset_id, q.query_hash)] = q
+        self._drift_cache.clear()
+
+        has_snapshot = self.persist_path.exists() and self.persist_path.stat().st_size > 0
+        snapshot = _iter_snapshot(self.persist_path) if has_snapshot else ()
+        for section, item in snapshot:
+            if section == "schemas":
+                s = StoredSchema(**_intern_ids(item))
+                self._schemas[(s.dataset_id, s.version)] = s
+            elif section == "analyses":
+                a = StoredAnalysis(**_intern_ids(_upgrade_created_at(item)))
+                self._analyses[(a.dataset_id, a.version)] = a
+            elif section == "insights":
+                self._index_insight(StoredInsight(**_intern_ids(item)))
+            elif section == "query_cache":
+                q = QueryCacheEntry(**_intern_ids(_upgrade_created_at(item)))
+                self._query_cache[(q.dataset_id, q.query_hash)] = q
+            else:
+                d = DriftCacheEntry(**_upgrade_created_at(item))
+                self._drift_cache[d.drift_key] = d
+        # Version/hash indexes in one sorted pass rather than per-schema inserts
+        for ds, v in sorted(self._schemas):
+            self._versions_by_dataset.setdefault(ds, []).append(v)
+            self._hash_index.setdefault((ds, normalize_file_hash(self._schemas[(ds, v)].file_hash)), v)
+
+        self._log_lines = 0
+        torn = False
+        if self._log_path.exists():
+            with self._log_path.open("rb") as f:
+                for line in f:
+                    try:
+                        entry = _loads(line)
+                    except ValueError:
+                        torn = True  # interrupted append; later appends must not follow it
+                        break
+                    self._replay(entry["type"], entry["data"])
+                    self._log_lines += 1
+        if torn:
+            self.compact()
+
+    def _replay(self, type_tag: str, item: Dict[str, Any]) -> None:
+        """Apply one log record to the indexes, with the same semantics as its save_* call."""
+        if type_tag == "drift":
+            d = DriftCacheEntry(**_upgrade_created_at(item))
+            self._drift_cache[d.drift_key] = d
+            return
+        record = _LOG_RECORD_TYPES[type_tag][0](**_intern_ids(_upgrade_created_at(item)))
+        if type_tag == "schema":
+            self._index_schema(record)
+        elif type_tag == "analysis":
+            self._analyses[(record.dataset_id, record.version)] = record
+        elif type_tag == "insight":
+            if (record.dataset_id, record.semantic_hash) not in self._insight_semantic_index:
+                self._index_insight(record)
+        elif type_tag == "query":
+            self._query_cache[(record.dataset_id, record.query_hash)] = record
 
     def _flatten_insights(self) -> List[StoredInsight]:
         all_insights: List[StoredInsight] = []
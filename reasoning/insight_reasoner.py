@@ -31,17 +31,80 @@ import hashlib
 import json
 import math
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import asdict, dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
 
+try:  # optional dependency: fast non-cryptographic hashing for throwaway IDs
+    import xxhash
+except ImportError:  # pragma: no cover - depends on environment
+    xxhash = None
+
+try:  # optional dependency: faster JSON for prompt payloads and LLM output parsing
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+
+def _short_hash(text: str) -> str:
+    """16-hex-char non-cryptographic digest (xxh3_64, or 64-bit BLAKE2b without xxhash)."""
+    data = text.encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _dumps_compact(obj: Any) -> str:
+    """Compact JSON text (no whitespace, non-ASCII kept) for embedding in prompts."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+class _RawJSON(str):
+    """An already-serialized JSON value, spliced verbatim by `_dumps_context`."""
+
+
+def _raw_json(text: Optional[str]) -> Optional[_RawJSON]:
+    return _RawJSON(text) if text else None
+
+
+def _dumps_context(payload: Dict[str, Any]) -> str:
+    """
+    Compact JSON for a prompt's context object.
+
+    Top-level `_RawJSON` values (the compressed schema/analysis) are embedded as
+    JSON rather than re-encoded as escaped strings: cheaper to build, and fewer
+    tokens since quotes are not backslash-escaped.
+    """
+    return "{" + ",".join(
+        _dumps_compact(key) + ":" + (value if isinstance(value, _RawJSON) else _dumps_compact(value))
+        for key, value in payload.items()
+    ) + "}"
+
+# Completions at or below this temperature are treated as repeatable and cached
+_COMPLETE_CACHE_MAX_TEMPERATURE = 0.2
+
+# Dedup-key normalization (see InsightReasoner._normalize_text)
+_PUNCTUATION_RE = re.compile(r"[^\w\s\-]")
+# The ASCII characters _PUNCTUATION_RE removes, as a str.translate deletion table
+_ASCII_PUNCTUATION_TABLE = str.maketrans(
+    "", "", "".join(ch for ch in map(chr, range(128)) if _PUNCTUATION_RE.fullmatch(ch))
+)
+
 
 # -----------------------------
 # Output dataclass
 # -----------------------------
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Insight:
     insight_id: str
     title: str
@@ -80,6 +143,50 @@ You must ONLY use the provided context. Do not invent data.
 Do NOT compute statistics. Treat all numbers in the context as given.
 Return valid JSON only, with no markdown, no commentary."""
 
+# Static prompt text, assembled once; builders join it around the dynamic parts
+_SYNTHESIS_PROMPT_HEAD = f"""{SYSTEM_RULES}
+
+Task:
+Synthesize up to """
+_SYNTHESIS_PROMPT_MID = """ non-redundant insights by combining multiple signals when appropriate.
+
+Each insight must include:
+- title: short, specific
+- technical_summary: explain signals and how they connect
+- business_impact: why it matters in business terms (no made-up metrics)
+- confidence: float 0..1 based on support/consistency/strength in provided signals
+- dedup_key: a short normalized phrase capturing the semantic core (used for semantic hashing)
+
+Avoid duplicates vs existing_insights. Deduplicate semantically (not string equality).
+
+Return JSON in this exact shape:
+{"insights":[{"title":..., "technical_summary":..., "business_impact":..., "confidence":..., "dedup_key":...}, ...]}
+
+Context (JSON):
+"""
+
+_DEDUP_PROMPT_HEAD = f"""{SYSTEM_RULES}
+
+Task:
+Decide if candidate is semantically redundant with any existing item.
+Return JSON: {{"is_duplicate":true/false,"duplicate_of_insight_id":string_or_null,"reason":string}}
+
+Context:
+"""
+
+_QUERY_PROMPT_HEAD = f"""{SYSTEM_RULES}
+
+Task:
+Answer the user's question using ONLY the provided context.
+If the context is insufficient, say what is missing and suggest the minimum additional analysis needed.
+Do NOT compute new statistics or invent values.
+
+Return JSON in this shape:
+{{"answer":string,"used":["schema"|"analysis"|"insights"],"limitations":string}}
+
+Context (JSON):
+"""
+
 
 def build_synthesis_prompt(
     *,
@@ -101,8 +208,8 @@ def build_synthesis_prompt(
     payload = {
         "dataset_id": dataset_id,
         "version": version,
-        "schema": compressed_schema_json,
-        "analysis": compressed_analysis_result_json,
+        "schema": _raw_json(compressed_schema_json),
+        "analysis": _raw_json(compressed_analysis_result_json),
         "existing_insights": existing,
         "constraints": {
             "max_new_insights": max_new_insights,
@@ -111,27 +218,9 @@ def build_synthesis_prompt(
         },
     }
 
-    instruction = f"""{SYSTEM_RULES}
-
-Task:
-Synthesize up to {max_new_insights} non-redundant insights by combining multiple signals when appropriate.
-
-Each insight must include:
-- title: short, specific
-- technical_summary: explain signals and how they connect
-- business_impact: why it matters in business terms (no made-up metrics)
-- confidence: float 0..1 based on support/consistency/strength in provided signals
-- dedup_key: a short normalized phrase capturing the semantic core (used for semantic hashing)
-
-Avoid duplicates vs existing_insights. Deduplicate semantically (not string equality).
-
-Return JSON in this exact shape:
-{{"insights":[{{"title":..., "technical_summary":..., "business_impact":..., "confidence":..., "dedup_key":...}}, ...]}}
-
-Context (JSON):
-{json.dumps(payload, separators=(",", ":"), ensure_ascii=False)}
-"""
-    return instruction
+    return "".join(
+        (_SYNTHESIS_PROMPT_HEAD, str(max_new_insights), _SYNTHESIS_PROMPT_MID, _dumps_context(payload), "\n")
+    )
 
 
 def build_dedup_prompt(*, candidate: Insight, existing: Sequence[Dict[str, Any]]) -> str:
@@ -147,15 +236,7 @@ def build_dedup_prompt(*, candidate: Insight, existing: Sequence[Dict[str, Any]]
         },
         "existing": existing[:20],
     }
-    return f"""{SYSTEM_RULES}
-
-Task:
-Decide if candidate is semantically redundant with any existing item.
-Return JSON: {{"is_duplicate":true/false,"duplicate_of_insight_id":string_or_null,"reason":string}}
-
-Context:
-{json.dumps(payload, separators=(",", ":"), ensure_ascii=False)}
-"""
+    return "".join((_DEDUP_PROMPT_HEAD, _dumps_compact(payload), "\n"))
 
 
 def build_query_prompt(
@@ -177,23 +258,11 @@ def build_query_prompt(
         "dataset_id": dataset_id,
         "version": version,
         "question": question,
-        "schema": compressed_schema_json,
-        "analysis": compressed_analysis_result_json,
+        "schema": _raw_json(compressed_schema_json),
+        "analysis": _raw_json(compressed_analysis_result_json),
         "insights": list(insight_summaries)[:80],
     }
-    return f"""{SYSTEM_RULES}
-
-Task:
-Answer the user's question using ONLY the provided context.
-If the context is insufficient, say what is missing and suggest the minimum additional analysis needed.
-Do NOT compute new statistics or invent values.
-
-Return JSON in this shape:
-{{"answer":string,"used":["schema"|"analysis"|"insights"],"limitations":string}}
-
-Context (JSON):
-{json.dumps(payload, separators=(",", ":"), ensure_ascii=False)}
-"""
+    return "".join((_QUERY_PROMPT_HEAD, _dumps_context(payload), "\n"))
 
 
 # -----------------------------
@@ -232,6 +301,10 @@ class InsightReasoner:
         self.temperature = float(temperature)
         self.embedding_similarity_threshold = float(embedding_similarity_threshold)
         self.compression_client = compression_client  # Optional ScaledownCompressionClient
+        # LRU of LLM completions: (prompt hash, temperature) -> raw response
+        self._complete_cache: "OrderedDict[Tuple[str, float], str]" = OrderedDict()
+        self._complete_cache_cap = 256
+        self._complete_cache_lock = threading.Lock()
 
     # -----------------------------
     # Deterministic helpers
@@ -254,15 +327,48 @@ class InsightReasoner:
             print(f"Warning: Prompt compression failed ({e}), using original prompt")
             return prompt
 
+    def _complete(self, prompt: str, temperature: float, *, compress: bool = False) -> str:
+        """
+        LLM completion with an in-process LRU for near-deterministic calls.
+
+        Keyed on the prompt before compression, so a hit also skips the
+        compression round-trip. Only temperatures <= _COMPLETE_CACHE_MAX_TEMPERATURE
+        are cached; higher ones are expected to vary between calls.
+        """
+        cacheable = temperature <= _COMPLETE_CACHE_MAX_TEMPERATURE
+        if cacheable:
+            key = (_short_hash(prompt), temperature)
+            with self._complete_cache_lock:
+                hit = self._complete_cache.get(key)
+                if hit is not None:
+                    self._complete_cache.move_to_end(key)
+                    return hit
+
+        sent = self._maybe_compress_prompt(prompt) if compress else prompt
+        raw = self.llm.complete(prompt=sent, temperature=temperature)
+
+        if cacheable:
+            with self._complete_cache_lock:
+                self._complete_cache[key] = raw
+                self._complete_cache.move_to_end(key)
+                if len(self._complete_cache) > self._complete_cache_cap:
+                    self._complete_cache.popitem(last=False)
+        return raw
+
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _normalize_text(text: str) -> str:
         text = (text or "").strip().lower()
-        text = re.sub(r"\s+", " ", text)
-        # remove most punctuation to make hashes stable across minor phrasing
-        text = re.sub(r"[^\w\s\-]", "", text)
-        return text
+        # Collapse whitespace runs (equivalent to re.sub(r"\s+", " ") on stripped text)
+        text = " ".join(text.split())
+        # remove most punctuation to make hashes stable across minor phrasing;
+        # translate() covers ASCII, the regex handles Unicode punctuation
+        if text.isascii():
+            return text.translate(_ASCII_PUNCTUATION_TABLE)
+        return _PUNCTUATION_RE.sub("", text)
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def semantic_hash(dedup_key: str) -> str:
         """Deterministic semantic hash from a normalized dedup key."""
         norm = InsightReasoner._normalize_text(dedup_key)
@@ -298,36 +404,65 @@ class InsightReasoner:
 
     def _embedding_dedup(
         self,
-        candidate: Insight,
+        candidates: Sequence[Insight],
         existing_summaries: Sequence[Tuple[str, str]],
-    ) -> Tuple[bool, Optional[str]]:
+    ) -> List[Tuple[bool, Optional[str]]]:
         """
-        Dedup candidate vs existing using embeddings if client supports it.
+        Dedup candidates vs existing using embeddings if client supports it.
+
+        All candidates and existing summaries are embedded in one request and
+        compared in one matrix product.
 
         Args:
             existing_summaries: list of (insight_id, summary_text)
 
         Returns:
-            (is_duplicate, duplicate_of_insight_id)
+            (is_duplicate, duplicate_of_insight_id) per candidate, in order
         """
-        texts = [candidate.title + " " + candidate.technical_summary]
+        not_dup: List[Tuple[bool, Optional[str]]] = [(False, None)] * len(candidates)
+        if not candidates or not existing_summaries:
+            return not_dup
+
+        k = len(candidates)
+        texts = [c.title + " " + c.technical_summary for c in candidates]
         texts.extend([s for _, s in existing_summaries])
         emb = self.llm.embed(texts)
         if not emb or len(emb) != len(texts):
-            return False, None
+            return not_dup
 
-        cand_vec = emb[0]
-        best_id = None
-        best_sim = -1.0
-        for (insight_id, _), vec in zip(existing_summaries, emb[1:]):
-            sim = self._cosine_similarity(cand_vec, vec)
-            if sim > best_sim:
-                best_sim = sim
-                best_id = insight_id
+        # Imported here: only embedding dedup needs numpy, and importing the
+        # reasoner (e.g. from api.app at startup) must stay stdlib-only
+        import numpy as np
 
-        if best_sim >= self.embedding_similarity_threshold:
-            return True, best_id
-        return False, None
+        try:
+            mat = np.asarray(emb, dtype=np.float64)
+        except ValueError:
+            mat = None  # ragged: embeddings of differing lengths
+
+        threshold = self.embedding_similarity_threshold
+        if mat is not None and mat.ndim == 2:
+            # Candidate x existing similarities in one product; zero vectors score 0
+            norms = np.linalg.norm(mat, axis=1)
+            dots = mat[:k] @ mat[k:].T
+            denom = norms[:k, None] * norms[None, k:]
+            sims = np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
+            # Any match is a duplicate; report the first one instead of the best
+            above = sims >= threshold
+            first = above.argmax(axis=1)
+            return [
+                (True, existing_summaries[j][0]) if is_dup else (False, None)
+                for is_dup, j in zip(above.any(axis=1).tolist(), first.tolist())
+            ]
+
+        result: List[Tuple[bool, Optional[str]]] = []
+        for cand_vec in emb[:k]:
+            dup_of = None
+            for (insight_id, _), vec in zip(existing_summaries, emb[k:]):
+                if self._cosine_similarity(cand_vec, vec) >= threshold:
+                    dup_of = insight_id
+                    break
+            result.append((dup_of is not None, dup_of))
+        return result
 
     # -----------------------------
     # Public API
@@ -363,10 +498,8 @@ class InsightReasoner:
             max_new_insights=self.max_new_insights,
         )
 
-        # Optional compression: reduce token count before sending to LLM
-        prompt = self._maybe_compress_prompt(prompt)
-
-        raw = self.llm.complete(prompt=prompt, temperature=self.temperature)
+        # Optional compression (on cache miss): reduce token count before sending to LLM
+        raw = self._complete(prompt, self.temperature, compress=True)
         parsed = self._parse_llm_json(raw)
         candidates = parsed.get("insights", [])
 
@@ -376,9 +509,10 @@ class InsightReasoner:
         existing_pairs: List[Tuple[str, str]] = []
         for idx, s in enumerate(existing_insight_summaries[:50]):
             # We may not have their IDs here; fabricate stable pseudo-IDs based on index+hash
-            pseudo_id = hashlib.sha256(f"{dataset_id}|existing|{idx}|{s}".encode("utf-8")).hexdigest()[:16]
+            pseudo_id = _short_hash(f"{dataset_id}|existing|{idx}|{s}")
             existing_pairs.append((pseudo_id, s))
 
+        built: List[Insight] = []
         for c in candidates[: self.max_new_insights]:
             title = str(c.get("title", "")).strip()
             technical = str(c.get("technical_summary", "")).strip()
@@ -389,21 +523,27 @@ class InsightReasoner:
             sem_hash = self.semantic_hash(dedup_key)
             iid = self.insight_id(dataset_id, version, sem_hash)
 
-            candidate = Insight(
-                insight_id=iid,
-                title=title,
-                technical_summary=technical,
-                business_impact=business,
-                confidence=conf,
-                semantic_hash=sem_hash,
+            built.append(
+                Insight(
+                    insight_id=iid,
+                    title=title,
+                    technical_summary=technical,
+                    business_impact=business,
+                    confidence=conf,
+                    semantic_hash=sem_hash,
+                )
             )
 
+        # Embedding similarities for the whole batch up front (one embed request)
+        embedding_dups = self._embedding_dedup(built, existing_pairs)
+
+        seen_hashes: set[str] = set()  # semantic hashes of accepted insights
+        for candidate, (is_dup, _dup_of) in zip(built, embedding_dups):
             # First-pass deterministic dedup: semantic_hash collision within this batch
-            if any(x.semantic_hash == candidate.semantic_hash for x in insights):
+            if candidate.semantic_hash in seen_hashes:
                 continue
 
             # Second-pass: embedding-based semantic dedup vs existing summaries (preferred)
-            is_dup, _dup_of = self._embedding_dedup(candidate, existing_pairs)
             if is_dup:
                 continue
 
@@ -414,6 +554,7 @@ class InsightReasoner:
                     continue
 
             insights.append(candidate)
+            seen_hashes.add(candidate.semantic_hash)
 
         return insights
 
@@ -448,10 +589,8 @@ class InsightReasoner:
             insight_summaries=insight_summaries,
         )
 
-        # Optional compression: reduce token count before sending to LLM
-        prompt = self._maybe_compress_prompt(prompt)
-
-        raw = self.llm.complete(prompt=prompt, temperature=self.temperature)
+        # Optional compression (on cache miss): reduce token count before sending to LLM
+        raw = self._complete(prompt, self.temperature, compress=True)
         parsed = self._parse_llm_json(raw)
         ans = parsed.get("answer")
         if isinstance(ans, str) and ans.strip():
@@ -475,7 +614,7 @@ class InsightReasoner:
 
         # Try direct parse
         try:
-            obj = json.loads(text)
+            obj = _loads(text)
             if isinstance(obj, dict):
                 return obj
         except Exception:
@@ -486,7 +625,7 @@ class InsightReasoner:
         end = text.rfind("}")
         if start != -1 and end != -1 and end > start:
             try:
-                obj = json.loads(text[start : end + 1])
+                obj = _loads(text[start : end + 1])
                 if isinstance(obj, dict):
                     return obj
             except Exception:
@@ -500,7 +639,7 @@ class InsightReasoner:
         Existing items should be compact dicts: {insight_id, summary/title}.
         """
         prompt = build_dedup_prompt(candidate=candidate, existing=list(existing))
-        raw = self.llm.complete(prompt=prompt, temperature=0.0)  # deterministic as possible
+        raw = self._complete(prompt, 0.0)  # deterministic as possible
         parsed = self._parse_llm_json(raw)
         return bool(parsed.get("is_duplicate", False))
 